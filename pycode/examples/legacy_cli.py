@@ -1,4 +1,4 @@
-"""Main CLI entry point"""
+"""Legacy click-based CLI entry point, kept for reference (use `pycode` instead)"""
 
 import click
 import asyncio
@@ -14,7 +14,6 @@ Commands:
   stats     - Show PyCode statistics
 """
 
-import asyncio
 import argparse
 import sys
 from pathlib import Path
@@ -22,7 +21,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from pycode.cli import Commands
+from pycode.cli import Commands, run
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -66,11 +65,11 @@ def create_parser() -> argparse.ArgumentParser:
 
     # clear command
     clear_parser = subparsers.add_parser("clear", help="Clear session history")
-    clear_parser.add_argument("session_id", help="Session ID to clear")
+    clear_parser.add_argument("session_id", nargs="+", help="Session ID(s) to clear")
 
     # delete command
     delete_parser = subparsers.add_parser("delete", help="Delete a session")
-    delete_parser.add_argument("session_id", help="Session ID to delete")
+    delete_parser.add_argument("session_id", nargs="+", help="Session ID(s) to delete")
 
     # config command
     config_parser = subparsers.add_parser("config", help="Configuration management")
@@ -111,10 +110,10 @@ async def main():
             )
 
         elif args.command == "clear":
-            await commands.clear_session(args.session_id)
+            await commands.clear_sessions(args.session_id)
 
         elif args.command == "delete":
-            await commands.delete_session(args.session_id)
+            await commands.delete_sessions(args.session_id)
 
         elif args.command == "config":
             if args.config_command == "show" or not args.config_command:
@@ -133,7 +132,9 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        await commands.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
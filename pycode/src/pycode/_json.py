@@ -0,0 +1,29 @@
+"""JSON encoding shared by the message log and the HTTP providers
+
+Uses orjson when it is installed (the speedups extra) and the stdlib json
+module otherwise. Both produce the same compact UTF-8 output, and
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+json.JSONDecodeError either way.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (same shape with or without orjson)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -4,6 +4,6 @@ PyCode CLI
 Command-line interface for PyCode.
 """
 
-from .commands import Commands
+from .commands import Commands, run
 
-__all__ = ["Commands"]
+__all__ = ["Commands", "run"]
@@ -7,24 +7,67 @@ Implements PyCode command-line interface commands.
 import asyncio
 import os
 import sys
-from pathlib import Path
-from typing import Any
+import time
+import traceback
+from collections import Counter
+from typing import Any, Coroutine, TypeVar
 from rich.console import Console
-from rich.table import Table
+from rich.table import Column, Table
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 
-from ..config import ConfigManager, load_config
+from ..config import ConfigManager, PyCodeConfig
 from ..session_manager import SessionManager
-from ..history import MessageHistory
 from ..storage import Storage
 from ..core import Session
 from ..agents import BuildAgent, PlanAgent
 from ..tools import ToolRegistry
 from ..runner import AgentRunner, RunConfig
 
+T = TypeVar("T")
 
-console = Console()
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run main to completion in a new event loop, like asyncio.run()
+
+    The loop is uvloop's faster one when it is installed (not on Windows).
+    Only the CLI entry points call this, so importing the CLI changes no
+    global event loop state.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+# Output here is short styled lines with explicit markup, so skip the
+# regex-based auto highlighter and :emoji: code substitution on every print
+console = Console(highlight=False, emoji=False, soft_wrap=True)
+
+# Max seconds streamed output may sit in the stdout buffer before a flush
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Column schema for the session list, configured once at import
+_SESSION_COLUMNS = (
+    Column("Session ID", style="cyan", no_wrap=True),
+    Column("Project", style="green"),
+    Column("Title", style="white"),
+    Column("Messages", justify="right", style="blue"),
+    Column("Last Activity", style="yellow"),
+)
+
+
+def _new_session_table() -> Table:
+    """Fresh session list table built from the shared column template"""
+    # Columns hold their cells, so each table gets its own copies
+    return Table(
+        *(column.copy() for column in _SESSION_COLUMNS),
+        show_header=True,
+        header_style="bold magenta",
+    )
 
 
 class Commands:
@@ -34,7 +77,39 @@ class Commands:
         self.config_manager = ConfigManager()
         self.storage = Storage()
         self.session_manager = SessionManager(self.storage)
-        self.history = MessageHistory(self.storage)
+        self.history = self.session_manager.history
+        self._api_key: str | None = None
+        # One provider (and its pooled HTTP connections) per API key
+        self._providers: dict[str, Any] = {}
+
+    @property
+    def config(self) -> PyCodeConfig:
+        """Configuration, loaded once and reused for the lifetime of Commands"""
+        return self.config_manager.load()
+
+    def invalidate_config(self) -> None:
+        """Forget the loaded configuration so the next access re-reads it"""
+        self.config_manager.invalidate()
+
+    def _require_api_key(self) -> str | None:
+        """Return the Anthropic API key, or print setup help if it is unset"""
+        if self._api_key is None:
+            self._api_key = os.getenv("ANTHROPIC_API_KEY") or None
+
+        if not self._api_key:
+            console.print("\n[red]Error: ANTHROPIC_API_KEY not set[/red]")
+            console.print("\nSet your API key:")
+            console.print("  [green]export ANTHROPIC_API_KEY=\"sk-ant-...\"[/green]")
+            console.print("\nOr run the setup:")
+            console.print("  [green]python setup_api_key.py[/green]")
+
+        return self._api_key
+
+    async def close(self) -> None:
+        """Close cached provider clients"""
+        for provider in self._providers.values():
+            await provider.close()
+        self._providers.clear()
 
     async def list_sessions(self, project_id: str | None = None, limit: int = 20) -> None:
         """List all sessions
@@ -45,35 +120,35 @@ class Commands:
         """
         console.print("\n[bold cyan]PyCode Sessions[/bold cyan]\n")
 
-        sessions = await self.session_manager.list_sessions(project_id, limit)
+        sessions = self.session_manager.iter_sessions(project_id, limit, display=True)
+        first = await anext(sessions, None)
 
-        if not sessions:
+        if first is None:
             console.print("[yellow]No sessions found.[/yellow]")
             console.print("\nCreate a new session with:")
             console.print("  [green]pycode run \"your request\"[/green]")
             return
 
-        # Create table
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Session ID", style="cyan", no_wrap=True)
-        table.add_column("Project", style="green")
-        table.add_column("Title", style="white")
-        table.add_column("Messages", justify="right", style="blue")
-        table.add_column("Last Activity", style="yellow")
+        table = _new_session_table()
 
-        for session in sessions:
-            # Truncate session ID for display
-            session_id_short = session["session_id"][:20] + "..."
+        def add_row(session: dict[str, Any]) -> None:
             table.add_row(
-                session_id_short,
+                session["session_id_short"],
                 session["project_id"],
                 session["title"],
-                str(session["message_count"]),
-                session["last_activity"][:19],  # Just date and time
+                session["message_count_text"],
+                session["last_activity_short"],
             )
 
-        console.print(table)
-        console.print(f"\n[dim]Showing {len(sessions)} sessions[/dim]")
+        # Render rows as they arrive instead of after the full scan
+        shown = 1
+        with Live(table, console=console, refresh_per_second=8):
+            add_row(first)
+            async for session in sessions:
+                add_row(session)
+                shown += 1
+
+        console.print(f"\n[dim]Showing {shown} sessions[/dim]")
         console.print("\nResume a session with:")
         console.print("  [green]pycode resume <session-id>[/green]")
 
@@ -96,21 +171,16 @@ class Commands:
         console.print(f"  Directory: [blue]{session.directory}[/blue]")
 
         # Load conversation history
-        messages = await self.history.load_messages(session.id, limit=10)
-        console.print(f"  Messages: [yellow]{len(messages)}[/yellow]")
+        message_count = await self.history.get_message_count(session.id)
+        console.print(f"  Messages: [yellow]{message_count}[/yellow]")
 
         # Show last few messages
-        if messages:
+        previews = await self.history.load_recent_previews(session.id, 3)
+        if previews:
             console.print("\n[bold]Recent conversation:[/bold]")
-            for msg in messages[-3:]:
-                role = "🧑 User" if msg.role == "user" else "🤖 Assistant"
-                # Get first text part
-                text = ""
-                for part in msg.parts:
-                    if part.type == "text":
-                        text = part.text[:100] + ("..." if len(part.text) > 100 else "")
-                        break
-                console.print(f"  {role}: [dim]{text}[/dim]")
+            for role, text in previews:
+                role_label = "🧑 User" if role == "user" else "🤖 Assistant"
+                console.print(f"  {role_label}: [dim]{text}[/dim]")
 
         # Get new request if not provided
         if not request:
@@ -124,30 +194,50 @@ class Commands:
         # Continue session
         await self._run_session(session, request)
 
+    async def _load_for_confirm(self, session_ids: list[str]) -> list[Session]:
+        """Look up sessions in one pass and report any that are missing"""
+        found = await self.session_manager.load_sessions(session_ids)
+
+        sessions = []
+        for session_id in dict.fromkeys(session_ids):
+            if session_id in found:
+                sessions.append(found[session_id])
+            else:
+                console.print(f"[red]Session not found: {session_id}[/red]")
+        return sessions
+
     async def clear_session(self, session_id: str) -> None:
         """Clear session history
 
         Args:
             session_id: Session ID to clear
         """
-        # Load session first
-        session = await self.session_manager.load_session(session_id)
-        if not session:
-            console.print(f"[red]Session not found: {session_id}[/red]")
+        await self.clear_sessions([session_id])
+
+    async def clear_sessions(self, session_ids: list[str]) -> None:
+        """Clear history for one or more sessions after a single confirmation
+
+        Args:
+            session_ids: Session IDs to clear
+        """
+        sessions = await self._load_for_confirm(session_ids)
+        if not sessions:
             return
 
         # Confirm
-        console.print(f"\n[yellow]Clear history for session:[/yellow]")
-        console.print(f"  Project: {session.project_id}")
-        console.print(f"  Title: {session.title}")
+        for session in sessions:
+            console.print(f"\n[yellow]Clear history for session:[/yellow]")
+            console.print(f"  Project: {session.project_id}")
+            console.print(f"  Title: {session.title}")
 
         if not Confirm.ask("\nAre you sure? This cannot be undone"):
             console.print("[dim]Cancelled[/dim]")
             return
 
         # Clear history
-        await self.history.clear_history(session.id)
-        console.print(f"\n[green]✓[/green] Session history cleared: {session_id}")
+        for session in sessions:
+            await self.history.clear_history(session.id)
+            console.print(f"\n[green]✓[/green] Session history cleared: {session.id}")
 
     async def delete_session(self, session_id: str) -> None:
         """Delete a session completely
@@ -155,24 +245,31 @@ class Commands:
         Args:
             session_id: Session ID to delete
         """
-        # Load session first
-        session = await self.session_manager.load_session(session_id)
-        if not session:
-            console.print(f"[red]Session not found: {session_id}[/red]")
+        await self.delete_sessions([session_id])
+
+    async def delete_sessions(self, session_ids: list[str]) -> None:
+        """Delete one or more sessions after a single confirmation
+
+        Args:
+            session_ids: Session IDs to delete
+        """
+        sessions = await self._load_for_confirm(session_ids)
+        if not sessions:
             return
 
         # Confirm
-        console.print(f"\n[red]Delete session:[/red]")
-        console.print(f"  Project: {session.project_id}")
-        console.print(f"  Title: {session.title}")
+        for session in sessions:
+            console.print(f"\n[red]Delete session:[/red]")
+            console.print(f"  Project: {session.project_id}")
+            console.print(f"  Title: {session.title}")
 
         if not Confirm.ask("\nAre you sure? This will delete all history"):
             console.print("[dim]Cancelled[/dim]")
             return
 
         # Delete
-        await self.session_manager.delete_session(session.id, session.project_id)
-        console.print(f"\n[green]✓[/green] Session deleted: {session_id}")
+        for session_id in await self.session_manager.delete_sessions(sessions):
+            console.print(f"\n[green]✓[/green] Session deleted: {session_id}")
 
     async def run_new_session(
         self,
@@ -191,7 +288,7 @@ class Commands:
         """
         # Use defaults if not provided
         project_id = project_id or "default"
-        directory = directory or str(Path.cwd())
+        directory = directory or os.getcwd()
 
         # Create session
         session = await self.session_manager.create_session(
@@ -221,8 +318,13 @@ class Commands:
             request: User request
             agent_name: Agent to use
         """
+        # Fail before building the agent, provider and tools
+        api_key = self._require_api_key()
+        if not api_key:
+            return
+
         # Load config
-        config = load_config()
+        config = self.config
 
         # Get agent
         if agent_name == "build":
@@ -236,17 +338,12 @@ class Commands:
         # Setup provider
         from ..providers import AnthropicProvider, ProviderConfig
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            console.print("\n[red]Error: ANTHROPIC_API_KEY not set[/red]")
-            console.print("\nSet your API key:")
-            console.print("  [green]export ANTHROPIC_API_KEY=\"sk-ant-...\"[/green]")
-            console.print("\nOr run the setup:")
-            console.print("  [green]python setup_api_key.py[/green]")
-            return
-
-        provider_config = ProviderConfig(api_key=api_key)
-        provider = AnthropicProvider(provider_config)
+        # Reuse the provider across runs so its connections stay warm
+        provider = self._providers.get(api_key)
+        if provider is None:
+            provider_config = ProviderConfig(name="anthropic", api_key=api_key)
+            provider = AnthropicProvider(provider_config)
+            self._providers[api_key] = provider
 
         # Setup tools
         from ..tools import (
@@ -289,6 +386,7 @@ class Commands:
             provider=provider,
             registry=registry,
             config=run_config,
+            storage=self.storage,
         )
 
         # Run!
@@ -297,8 +395,20 @@ class Commands:
         console.print("=" * 70 + "\n")
 
         try:
+            # Write streamed text straight to stdout (no markup parsing per
+            # chunk) and only flush on newlines or every STREAM_FLUSH_INTERVAL
+            write = sys.stdout.write
+            flush = sys.stdout.flush
+            last_flush = time.monotonic()
+
             async for chunk in runner.run(request):
-                console.print(chunk, end="")
+                write(chunk)
+                now = time.monotonic()
+                if "\n" in chunk or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                    flush()
+                    last_flush = now
+
+            flush()
 
             console.print("\n\n" + "=" * 70)
             console.print("[bold green]✓ Complete![/bold green]")
@@ -308,12 +418,13 @@ class Commands:
             console.print("\n\n[yellow]Interrupted by user[/yellow]")
         except Exception as e:
             console.print(f"\n\n[red]Error: {e}[/red]")
-            import traceback
-            traceback.print_exc()
+            # Formatting every frame is costly; only do it when asked to
+            if config.runtime.verbose:
+                traceback.print_exc()
 
     async def show_config(self) -> None:
         """Show current configuration"""
-        config = load_config()
+        config = self.config
 
         console.print("\n[bold cyan]PyCode Configuration[/bold cyan]\n")
 
@@ -364,6 +475,7 @@ class Commands:
 
         # Create default config
         self.config_manager.create_default_config()
+        self.invalidate_config()
         console.print("\n[green]✓[/green] Configuration initialized!")
         console.print("\nEdit the file to customize PyCode behavior.")
 
@@ -371,6 +483,11 @@ class Commands:
         """Show PyCode statistics"""
         console.print("\n[bold cyan]PyCode Statistics[/bold cyan]\n")
 
+        # Cheap file count first; skip loading anything when there is nothing
+        if await self.storage.count_sessions() == 0:
+            console.print("[yellow]No sessions yet.[/yellow]\n")
+            return
+
         # Count sessions
         sessions = await self.session_manager.list_sessions(limit=1000)
         total_sessions = len(sessions)
@@ -379,16 +496,15 @@ class Commands:
         total_messages = sum(s["message_count"] for s in sessions)
 
         # Projects
-        projects = set(s["project_id"] for s in sessions)
+        project_counts = Counter(s["project_id"] for s in sessions)
 
         console.print(f"  Total sessions: [green]{total_sessions}[/green]")
         console.print(f"  Total messages: [blue]{total_messages}[/blue]")
-        console.print(f"  Projects: [yellow]{len(projects)}[/yellow]")
+        console.print(f"  Projects: [yellow]{len(project_counts)}[/yellow]")
 
-        if projects:
+        if project_counts:
             console.print("\n[bold]Projects:[/bold]")
-            for project in sorted(projects):
-                project_sessions = [s for s in sessions if s["project_id"] == project]
-                console.print(f"  {project}: {len(project_sessions)} sessions")
+            for project, count in sorted(project_counts.items()):
+                console.print(f"  {project}: {count} sessions")
 
         console.print()
@@ -7,211 +7,429 @@ Supports running agents, managing sessions, configuration, and more.
 
 import argparse
 import asyncio
+import functools
+import importlib
 import os
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
-
-from .core import Session
-from .agents import BuildAgent, PlanAgent
-from .tools import ToolRegistry
-from .runner import AgentRunner, RunConfig
-from .config import ConfigManager, load_config
-from .session_manager import SessionManager
-from .storage import Storage
-from .logging import configure_logging, LogLevel, get_logger
-from .provider_aliases import resolve_provider, resolve_model, get_default_model
-from .ui import get_ui
-from . import __version__
+from typing import Any, Optional
+
+from .. import __version__
+from .commands import run
+
+# Subcommand -> short help, used on its own when only the command list is shown
+COMMAND_HELP = {
+    "run": "Run PyCode with a message",
+    "session": "Manage sessions",
+    "config": "Manage configuration",
+    "providers": "List available providers",
+    "models": "List available models",
+    "repl": "Start interactive REPL mode",
+}
+
+COMMANDS = tuple(COMMAND_HELP)
+
+# provider name -> (module under pycode.providers, class name, default base URL)
+# Providers with a default base URL are configured by URL instead of API key
+PROVIDER_SPECS: dict[str, tuple[str, str, Optional[str]]] = {
+    "anthropic": ("anthropic_provider", "AnthropicProvider", None),
+    "openai": ("openai_provider", "OpenAIProvider", None),
+    "ollama": ("ollama_provider", "OllamaProvider", "http://localhost:11434"),
+    "gemini": ("gemini_provider", "GeminiProvider", None),
+    "mistral": ("mistral_provider", "MistralProvider", None),
+    "cohere": ("cohere_provider", "CohereProvider", None),
+}
+
+# Environment variable holding each provider's API key (None: no key needed)
+_API_KEY_ENV: dict[str, Optional[str]] = {
+    "anthropic": "ANTHROPIC_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "ollama": None,
+    "gemini": "GEMINI_API_KEY",
+    "mistral": "MISTRAL_API_KEY",
+    "cohere": "COHERE_API_KEY",
+}
+
+# Rows for `pycode providers`
+_PROVIDER_TABLE_ROWS = (
+    ("anthropic", "Anthropic (Claude)", "✅"),
+    ("openai", "OpenAI (GPT)", "⚠️ Requires package"),
+    ("ollama", "Ollama (Local)", "✅"),
+    ("gemini", "Google (Gemini)", "✅"),
+    ("mistral", "Mistral AI", "✅"),
+    ("cohere", "Cohere", "✅"),
+)
+
+# Streamed output is flushed once this many bytes are buffered...
+STREAM_FLUSH_BYTES = 4096
+# ...or once it has been buffered for this many seconds
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Global options that consume the following token as their value
+_GLOBAL_VALUE_OPTIONS = ("--config", "--log-level", "--log-file")
+
+
+def _sniff_subcommand(argv: list[str]) -> Optional[str]:
+    """Find the subcommand in argv without running argparse
+
+    Returns None when there is no known command or top-level help was
+    requested before one, meaning the full parser is needed.
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ("-h", "--help"):
+            return None
+        if token in _GLOBAL_VALUE_OPTIONS:
+            next(tokens, None)
+            continue
+        if token.startswith("-"):
+            continue
+        return token if token in COMMANDS else None
+
+    return None
+
+
+def _is_sync_command(args: argparse.Namespace) -> bool:
+    """Whether the parsed command can run without an event loop"""
+    if args.command in (None, "providers", "models"):
+        return True
+    return args.command == "config" and args.config_command == "path"
+
+
+@functools.lru_cache(maxsize=1)
+def _provider_alias_rows() -> tuple[tuple[str, str], ...]:
+    """Rows for `pycode providers --aliases`"""
+    from ..provider_aliases import PROVIDER_ALIASES
+
+    return tuple(PROVIDER_ALIASES.items())
+
+
+@functools.lru_cache(maxsize=16)
+def _model_rows(provider: Optional[str] = None) -> tuple[tuple[str, str], ...]:
+    """Rows for `pycode models`, limited to one provider when given
+
+    The alias tables are module constants, so results are cached for the
+    life of the process.
+    """
+    from ..provider_aliases import MODEL_ALIASES
+
+    if provider:
+        return tuple(
+            (alias, model)
+            for alias, (p, model) in MODEL_ALIASES.items()
+            if p == provider
+        )
+
+    return tuple(
+        (alias, f"{p}/{model}")
+        for alias, (p, model) in MODEL_ALIASES.items()
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Create argument parser (cached per command)
+
+    Only the subparser for ``command`` is built. When it is None every
+    command is added by name only, which is all help and error output need.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pycode",
+        description="PyCode - AI Coding Agent in Python",
+        epilog="For more information, visit: https://github.com/yourusername/pycode"
+    )
+
+    parser.add_argument(
+        "-V", "--version",
+        action="version",
+        version=f"PyCode {__version__}"
+    )
+
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="Path to config file"
+    )
+
+    parser.add_argument(
+        "--log-level",
+        choices=["quiet", "normal", "verbose", "debug"],
+        default="normal",
+        help="Logging level (default: normal)"
+    )
+
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        help="Write logs to file"
+    )
+
+    # Create subparsers for commands
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    builders = {
+        "run": _add_run_parser,
+        "session": _add_session_parser,
+        "config": _add_config_parser,
+        "providers": _add_providers_parser,
+        "models": _add_models_parser,
+        "repl": _add_repl_parser,
+    }
+
+    if command in builders:
+        builders[command](subparsers)
+    else:
+        # Help, usage errors and the no-command case only show command
+        # names and their short help, so skip the per-command arguments
+        for name, help_text in COMMAND_HELP.items():
+            subparsers.add_parser(name, help=help_text)
+
+    return parser
+
+
+def _add_run_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the run command"""
+    run_parser = subparsers.add_parser(
+        "run",
+        help=COMMAND_HELP["run"]
+    )
+    run_parser.add_argument(
+        "message",
+        nargs="+",
+        help="Your request to the AI"
+    )
+    run_parser.add_argument(
+        "--agent",
+        choices=["build", "plan"],
+        default="build",
+        help="Agent to use (default: build)"
+    )
+    run_parser.add_argument(
+        "--provider",
+        help="Provider to use (e.g., anthropic, openai, ollama)"
+    )
+    run_parser.add_argument(
+        "--model",
+        help="Model to use (e.g., sonnet, gpt-4, llama3.2)"
+    )
+    run_parser.add_argument(
+        "--directory",
+        type=Path,
+        default=Path.cwd(),
+        help="Working directory (default: current directory)"
+    )
+    run_parser.add_argument(
+        "--max-iterations",
+        type=int,
+        help="Maximum iterations"
+    )
+    run_parser.add_argument(
+        "--auto-approve",
+        action="store_true",
+        help="Auto-approve all tool calls"
+    )
+    run_parser.add_argument(
+        "--session",
+        help="Resume existing session by ID"
+    )
+
+
+def _add_session_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the session commands"""
+    session_parser = subparsers.add_parser(
+        "session",
+        help=COMMAND_HELP["session"]
+    )
+    session_subparsers = session_parser.add_subparsers(dest="session_command")
+
+    session_subparsers.add_parser(
+        "list",
+        help="List all sessions"
+    )
+
+    resume_parser = session_subparsers.add_parser(
+        "resume",
+        help="Resume a session"
+    )
+    resume_parser.add_argument("session_id", help="Session ID to resume")
+
+    delete_parser = session_subparsers.add_parser(
+        "delete",
+        help="Delete a session"
+    )
+    delete_parser.add_argument("session_id", help="Session ID to delete")
+
+    clean_parser = session_subparsers.add_parser(
+        "clean",
+        help="Clean old sessions"
+    )
+    clean_parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Delete sessions older than N days"
+    )
+
+
+def _add_config_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the config commands"""
+    config_parser = subparsers.add_parser(
+        "config",
+        help=COMMAND_HELP["config"]
+    )
+    config_subparsers = config_parser.add_subparsers(dest="config_command")
+
+    config_subparsers.add_parser(
+        "show",
+        help="Show current configuration"
+    )
+
+    config_subparsers.add_parser(
+        "init",
+        help="Create default configuration file"
+    )
+
+    config_subparsers.add_parser(
+        "path",
+        help="Show config file path"
+    )
+
+
+def _add_providers_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the providers command"""
+    provider_parser = subparsers.add_parser(
+        "providers",
+        help=COMMAND_HELP["providers"]
+    )
+    provider_parser.add_argument(
+        "--aliases",
+        action="store_true",
+        help="Show provider aliases"
+    )
+
+
+def _add_models_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the models command"""
+    models_parser = subparsers.add_parser(
+        "models",
+        help=COMMAND_HELP["models"]
+    )
+    models_parser.add_argument(
+        "--provider",
+        help="Filter by provider"
+    )
+
+
+def _add_repl_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the interactive REPL command"""
+    subparsers.add_parser(
+        "repl",
+        help=COMMAND_HELP["repl"]
+    )
 
 
 class PyCodeCLI:
     """Main CLI application"""
 
-    def __init__(self):
-        self.parser = self._create_parser()
-        self.logger = get_logger()
-        self.ui = get_ui()
-
-    def _create_parser(self) -> argparse.ArgumentParser:
-        """Create argument parser"""
-        parser = argparse.ArgumentParser(
-            prog="pycode",
-            description="PyCode - AI Coding Agent in Python",
-            epilog="For more information, visit: https://github.com/yourusername/pycode"
-        )
+    def __init__(self, argv: Optional[list[str]] = None):
+        self.argv = sys.argv[1:] if argv is None else argv
+        self.command = _sniff_subcommand(self.argv)
+        self._prompt_session = None
+        self._config_path: Optional[Path] = None
+        self._config_manager = None
+        self._provider_cache: dict[str, Any] = {}
 
-        parser.add_argument(
-            "--version",
-            action="version",
-            version=f"PyCode {__version__}"
-        )
+    @property
+    def parser(self) -> argparse.ArgumentParser:
+        """Argument parser for the current command"""
+        return _build_parser(self.command)
 
-        parser.add_argument(
-            "--config",
-            type=Path,
-            help="Path to config file"
-        )
+    @property
+    def config_manager(self):
+        """Config manager for the --config path, shared by all commands"""
+        if self._config_manager is None:
+            from ..config import ConfigManager
 
-        parser.add_argument(
-            "--log-level",
-            choices=["quiet", "normal", "verbose", "debug"],
-            default="normal",
-            help="Logging level (default: normal)"
-        )
+            self._config_manager = ConfigManager(self._config_path)
+        return self._config_manager
 
-        parser.add_argument(
-            "--log-file",
-            type=Path,
-            help="Write logs to file"
-        )
+    @functools.cached_property
+    def storage(self):
+        """Storage shared by every command run through this CLI"""
+        from ..storage import Storage
 
-        # Create subparsers for commands
-        subparsers = parser.add_subparsers(dest="command", help="Available commands")
+        return Storage()
 
-        # Run command
-        run_parser = subparsers.add_parser(
-            "run",
-            help="Run PyCode with a message"
-        )
-        run_parser.add_argument(
-            "message",
-            nargs="+",
-            help="Your request to the AI"
-        )
-        run_parser.add_argument(
-            "--agent",
-            choices=["build", "plan"],
-            default="build",
-            help="Agent to use (default: build)"
-        )
-        run_parser.add_argument(
-            "--provider",
-            help="Provider to use (e.g., anthropic, openai, ollama)"
-        )
-        run_parser.add_argument(
-            "--model",
-            help="Model to use (e.g., sonnet, gpt-4, llama3.2)"
-        )
-        run_parser.add_argument(
-            "--directory",
-            type=Path,
-            default=Path.cwd(),
-            help="Working directory (default: current directory)"
-        )
-        run_parser.add_argument(
-            "--max-iterations",
-            type=int,
-            help="Maximum iterations"
-        )
-        run_parser.add_argument(
-            "--auto-approve",
-            action="store_true",
-            help="Auto-approve all tool calls"
-        )
-        run_parser.add_argument(
-            "--session",
-            help="Resume existing session by ID"
-        )
+    @functools.cached_property
+    def session_manager(self):
+        """Session manager over the shared storage"""
+        from ..session_manager import SessionManager
 
-        # Session commands
-        session_parser = subparsers.add_parser(
-            "session",
-            help="Manage sessions"
-        )
-        session_subparsers = session_parser.add_subparsers(dest="session_command")
+        return SessionManager(self.storage)
 
-        session_subparsers.add_parser(
-            "list",
-            help="List all sessions"
-        )
+    @functools.cached_property
+    def logger(self):
+        """Logger, created on first use"""
+        from ..logging import get_logger
 
-        resume_parser = session_subparsers.add_parser(
-            "resume",
-            help="Resume a session"
-        )
-        resume_parser.add_argument("session_id", help="Session ID to resume")
+        return get_logger()
 
-        delete_parser = session_subparsers.add_parser(
-            "delete",
-            help="Delete a session"
-        )
-        delete_parser.add_argument("session_id", help="Session ID to delete")
+    @functools.cached_property
+    def ui(self):
+        """Terminal UI, created on first use"""
+        from ..ui import get_ui
 
-        clean_parser = session_subparsers.add_parser(
-            "clean",
-            help="Clean old sessions"
-        )
-        clean_parser.add_argument(
-            "--days",
-            type=int,
-            default=30,
-            help="Delete sessions older than N days"
-        )
+        return get_ui()
 
-        # Config commands
-        config_parser = subparsers.add_parser(
-            "config",
-            help="Manage configuration"
-        )
-        config_subparsers = config_parser.add_subparsers(dest="config_command")
+    def _create_provider(self, provider_name: str, config: Any) -> Optional[Any]:
+        """Create a provider from PROVIDER_SPECS, or log why it can't be"""
+        from ..providers import ProviderConfig
 
-        config_subparsers.add_parser(
-            "show",
-            help="Show current configuration"
+        provider_settings = config.providers.get(provider_name, {})
+        env_name = _API_KEY_ENV.get(provider_name)
+        api_key = getattr(provider_settings, 'api_key', None) or (
+            os.environ.get(env_name) if env_name else None
         )
 
-        config_subparsers.add_parser(
-            "init",
-            help="Create default configuration file"
-        )
+        spec = PROVIDER_SPECS.get(provider_name)
+        if spec is None:
+            self.logger.error("Unknown provider", provider=provider_name)
+            return None
 
-        config_subparsers.add_parser(
-            "path",
-            help="Show config file path"
-        )
+        module_name, class_name, default_base_url = spec
 
-        # Provider commands
-        provider_parser = subparsers.add_parser(
-            "providers",
-            help="List available providers"
-        )
-        provider_parser.add_argument(
-            "--aliases",
-            action="store_true",
-            help="Show provider aliases"
-        )
+        try:
+            # Import only the selected provider's module
+            module = importlib.import_module(f"..providers.{module_name}", __package__)
+            provider_class = getattr(module, class_name)
 
-        # Models command
-        models_parser = subparsers.add_parser(
-            "models",
-            help="List available models"
-        )
-        models_parser.add_argument(
-            "--provider",
-            help="Filter by provider"
-        )
+            if default_base_url:
+                base_url = getattr(provider_settings, 'base_url', None) or default_base_url
+                provider_config = ProviderConfig(name=provider_name, base_url=base_url)
+            else:
+                provider_config = ProviderConfig(name=provider_name, api_key=api_key)
 
-        # Interactive REPL
-        subparsers.add_parser(
-            "repl",
-            help="Start interactive REPL mode"
-        )
+            provider = provider_class(provider_config)
+
+        except Exception as e:
+            self.logger.error("Failed to create provider", provider=provider_name, error=str(e))
+            return None
 
-        return parser
+        return provider
 
     async def run_agent(self, args: argparse.Namespace) -> int:
         """Run the agent with a message"""
-        # Load config
-        config_manager = ConfigManager(args.config)
-        config = config_manager.load()
-
-        # Setup logging
+        from ..agents import BuildAgent, PlanAgent
+        from ..tools import default_registry
+        from ..runner import AgentRunner, RunConfig
+        from ..logging import LogLevel
+        from ..provider_aliases import resolve_provider, resolve_model, get_default_model
+
+        # Loaded once per CLI; REPL turns reuse it
+        config = self.config_manager.load()
         log_level = LogLevel(args.log_level)
-        configure_logging(
-            level=log_level,
-            log_file=args.log_file
-        )
 
         # Resolve provider and model
         provider_name = args.provider
@@ -240,8 +458,7 @@ class PyCodeCLI:
         )
 
         # Create or load session
-        storage = Storage()
-        session_manager = SessionManager(storage)
+        session_manager = self.session_manager
 
         if args.session:
             # Resume existing session
@@ -252,8 +469,10 @@ class PyCodeCLI:
             self.logger.info("Resumed session", session_id=session.id)
         else:
             # Create new session
-            session = Session(directory=str(args.directory))
-            await session_manager.save_session(session)
+            session = await session_manager.create_session(
+                project_id="default",
+                directory=str(args.directory),
+            )
             self.logger.info("Created session", session_id=session.id)
 
         # Create agent
@@ -265,58 +484,13 @@ class PyCodeCLI:
             self.logger.error("Unknown agent", agent=args.agent)
             return 1
 
-        # Create provider
-        provider_settings = config.providers.get(provider_name, {})
-        api_key = getattr(provider_settings, 'api_key', None) or os.getenv(
-            f"{provider_name.upper()}_API_KEY"
-        )
-
-        try:
-            # Import and create provider
-            if provider_name == "anthropic":
-                from .providers import AnthropicProvider, ProviderConfig
-                provider = AnthropicProvider(ProviderConfig(
-                    name=provider_name,
-                    api_key=api_key
-                ))
-            elif provider_name == "openai":
-                from .providers import OpenAIProvider, ProviderConfig
-                provider = OpenAIProvider(ProviderConfig(
-                    name=provider_name,
-                    api_key=api_key
-                ))
-            elif provider_name == "ollama":
-                from .providers import OllamaProvider, ProviderConfig
-                base_url = getattr(provider_settings, 'base_url', None) or "http://localhost:11434"
-                provider = OllamaProvider(ProviderConfig(
-                    name=provider_name,
-                    base_url=base_url
-                ))
-            elif provider_name == "gemini":
-                from .providers import GeminiProvider, ProviderConfig
-                provider = GeminiProvider(ProviderConfig(
-                    name=provider_name,
-                    api_key=api_key
-                ))
-            elif provider_name == "mistral":
-                from .providers import MistralProvider, ProviderConfig
-                provider = MistralProvider(ProviderConfig(
-                    name=provider_name,
-                    api_key=api_key
-                ))
-            elif provider_name == "cohere":
-                from .providers import CohereProvider, ProviderConfig
-                provider = CohereProvider(ProviderConfig(
-                    name=provider_name,
-                    api_key=api_key
-                ))
-            else:
-                self.logger.error("Unknown provider", provider=provider_name)
+        # Create provider, or reuse the one (and its connections) from an earlier run
+        provider = self._provider_cache.get(provider_name)
+        if provider is None:
+            provider = self._create_provider(provider_name, config)
+            if provider is None:
                 return 1
-
-        except Exception as e:
-            self.logger.error("Failed to create provider", provider=provider_name, error=str(e))
-            return 1
+            self._provider_cache[provider_name] = provider
 
         # Create runner
         run_config = RunConfig(
@@ -331,21 +505,61 @@ class PyCodeCLI:
             session=session,
             agent=agent,
             provider=provider,
-            registry=ToolRegistry(),
+            registry=default_registry(),
             config=run_config,
-            storage=storage
+            storage=self.storage
         )
 
         # Run with message
         message = " ".join(args.message)
 
+        # Stream encoded output straight to the byte buffer, coalescing chunks
+        # until a line ends, STREAM_FLUSH_BYTES pile up or
+        # STREAM_FLUSH_INTERVAL passes
+        stdout = sys.stdout
+        encoding = getattr(stdout, "encoding", None) or "utf-8"
+        stdout.flush()  # keep earlier text output ahead of the raw bytes
+        raw = getattr(stdout, "buffer", None)
+        if raw is not None:
+            write = raw.write
+            flush = raw.flush
+        else:
+            # Text-only stdout (e.g. replaced by a StringIO): each batch holds
+            # whole encoded chunks, so decode it back and write it as text
+            def write(data: bytearray) -> None:
+                stdout.write(data.decode(encoding, errors="replace"))
+
+            flush = stdout.flush
+        buf = bytearray()
+        last_flush = time.monotonic()
+
         try:
-            async for chunk in runner.run(message):
-                print(chunk, end="", flush=True)
+            try:
+                async for chunk in runner.run(message):
+                    buf += chunk.encode(encoding, errors="replace")
+                    now = time.monotonic()
+                    if (
+                        len(buf) >= STREAM_FLUSH_BYTES
+                        or "\n" in chunk
+                        or now - last_flush >= STREAM_FLUSH_INTERVAL
+                    ):
+                        write(buf)
+                        flush()
+                        buf.clear()
+                        last_flush = now
+            finally:
+                buf += b"\n"  # Final newline
+                write(buf)
+                flush()
 
-            print()  # Final newline
             return 0
 
+        except BrokenPipeError:
+            # Output reader went away (e.g. piped into head); point stdout at
+            # devnull so the interpreter's exit-time flush doesn't fail too
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 1
         except KeyboardInterrupt:
             self.logger.warning("Interrupted by user")
             return 130
@@ -355,31 +569,34 @@ class PyCodeCLI:
 
     async def list_sessions(self) -> int:
         """List all sessions"""
-        storage = Storage()
-        session_manager = SessionManager(storage)
+        from datetime import datetime
+
+        session_manager = self.session_manager
+        history = session_manager.history
 
-        sessions = await session_manager.list_sessions()
+        sessions = await session_manager.load_all_sessions()
 
         if not sessions:
             self.ui.print_status("No sessions found", style="yellow")
             return 0
 
+        # Count messages for all listed sessions in one pass
+        counts = await history.count_messages_bulk([session.id for session in sessions])
+
         # Build table data
         headers = ["ID", "Directory", "Created", "Updated", "Messages"]
         rows = []
 
         for session in sessions:
-            # Get message count
-            from .history import MessageHistory
-            history = MessageHistory(storage)
-            messages = await history.list_messages(session.id)
+            created = datetime.fromtimestamp(session.time_created / 1000)
+            updated = datetime.fromtimestamp(session.time_updated / 1000)
 
             rows.append([
-                session.id[:8] + "...",
+                session.id[:20] + "...",
                 session.directory,
-                session.created_at.strftime("%Y-%m-%d %H:%M"),
-                session.updated_at.strftime("%Y-%m-%d %H:%M"),
-                str(len(messages))
+                created.strftime("%Y-%m-%d %H:%M"),
+                updated.strftime("%Y-%m-%d %H:%M"),
+                str(counts.get(session.id, 0))
             ])
 
         self.ui.print_table("Sessions", headers, rows)
@@ -387,25 +604,26 @@ class PyCodeCLI:
 
     async def show_config(self, args: argparse.Namespace) -> int:
         """Show current configuration"""
-        config_manager = ConfigManager(args.config)
-        config = config_manager.load()
-
         import yaml
-        config_dict = config.model_dump(exclude_none=True)
-        yaml_str = yaml.safe_dump(config_dict, default_flow_style=False, sort_keys=False)
+
+        # libyaml's C dumper when PyYAML was built with it
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+        config_dict = self.config_manager.as_dict()
+        yaml_str = yaml.dump(config_dict, Dumper=dumper, default_flow_style=False, sort_keys=False)
 
         self.ui.print_code(yaml_str, language="yaml", title="Configuration")
         return 0
 
     async def init_config(self, args: argparse.Namespace) -> int:
         """Initialize default configuration"""
-        config_manager = ConfigManager(args.config)
-        config_manager.create_default_config()
+        self.config_manager.create_default_config()
+        self.config_manager.invalidate()
         return 0
 
     def show_config_path(self, args: argparse.Namespace) -> int:
         """Show config file path"""
-        config_manager = ConfigManager(args.config)
+        config_manager = self.config_manager
         config_file = config_manager.config_path or config_manager._find_config_file()
 
         if config_file:
@@ -421,67 +639,81 @@ class PyCodeCLI:
 
     def list_providers(self, args: argparse.Namespace) -> int:
         """List available providers"""
-        from .provider_aliases import PROVIDER_ALIASES, get_resolver
-
         if args.aliases:
-            # Show aliases
-            headers = ["Alias", "Provider"]
-            rows = [[alias, provider] for alias, provider in PROVIDER_ALIASES.items()]
-            self.ui.print_table("Provider Aliases", headers, rows)
+            self.ui.print_table("Provider Aliases", ["Alias", "Provider"], _provider_alias_rows())
         else:
-            # Show providers
-            providers = [
-                ["anthropic", "Anthropic (Claude)", "✅"],
-                ["openai", "OpenAI (GPT)", "⚠️ Requires package"],
-                ["ollama", "Ollama (Local)", "✅"],
-                ["gemini", "Google (Gemini)", "✅"],
-                ["mistral", "Mistral AI", "✅"],
-                ["cohere", "Cohere", "✅"],
-            ]
-
             self.ui.print_table(
                 "Available Providers",
                 ["Name", "Description", "Status"],
-                providers
+                _PROVIDER_TABLE_ROWS
             )
 
         return 0
 
     def list_models(self, args: argparse.Namespace) -> int:
         """List available models"""
-        from .provider_aliases import MODEL_ALIASES
-
         if args.provider:
+            from ..provider_aliases import resolve_provider
+
             provider = resolve_provider(args.provider)
-            # Filter by provider
-            rows = [
-                [alias, model]
-                for alias, (p, model) in MODEL_ALIASES.items()
-                if p == provider
-            ]
             title = f"Models for {provider}"
         else:
-            # All models
-            rows = [
-                [alias, f"{provider}/{model}"]
-                for alias, (provider, model) in MODEL_ALIASES.items()
-            ]
+            provider = None
             title = "All Model Aliases"
 
-        self.ui.print_table(title, ["Alias", "Model"], rows)
+        self.ui.print_table(title, ["Alias", "Model"], _model_rows(provider))
         return 0
 
+    async def _read_repl_line(self) -> str:
+        """Read one REPL line without blocking the event loop"""
+        if not sys.stdin.isatty():
+            return await asyncio.to_thread(input, ">>> ")
+
+        # One PromptSession for the whole REPL so history survives between lines
+        if self._prompt_session is None:
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.history import FileHistory
+
+            history_file = Path.home() / ".pycode" / "repl_history"
+            history_file.parent.mkdir(parents=True, exist_ok=True)
+            self._prompt_session = PromptSession(history=FileHistory(str(history_file)))
+
+        return await self._prompt_session.prompt_async(">>> ")
+
+    def _prewarm_run_imports(self) -> None:
+        """Import what the first run_agent call needs (runs in a thread)"""
+        try:
+            for module in ("..runner", "..agents", "..tools", "..history", "..provider_aliases"):
+                importlib.import_module(module, __package__)
+
+            provider_name = self.config_manager.load().default_model.provider
+            spec = PROVIDER_SPECS.get(provider_name)
+            if spec is not None:
+                importlib.import_module(f"..providers.{spec[0]}", __package__)
+        except Exception as e:
+            self.logger.debug("REPL prewarm failed", error=str(e))
+
     async def run_repl(self, args: argparse.Namespace) -> int:
         """Start interactive REPL"""
         self.logger.info("Starting REPL mode")
 
+        # Load the run path while the user types the first message
+        threading.Thread(target=self._prewarm_run_imports, daemon=True).start()
+
         print("\nPyCode Interactive REPL")
         print("Type 'exit' or 'quit' to exit")
         print("Type 'help' for available commands\n")
 
+        # All REPL turns continue one session
+        session = await self.session_manager.create_session(
+            project_id="default",
+            directory=str(Path.cwd()),
+            title="REPL session",
+        )
+
         while True:
             try:
-                user_input = input(">>> ").strip()
+                user_input = (await self._read_repl_line()).strip()
 
                 if not user_input:
                     continue
@@ -500,14 +732,14 @@ class PyCodeCLI:
                 # Run the agent with the message
                 # Create a namespace with default args
                 run_args = argparse.Namespace(
-                    message=user_input.split(),
+                    message=[user_input],
                     agent="build",
                     provider=None,
                     model=None,
                     directory=Path.cwd(),
                     max_iterations=None,
                     auto_approve=False,
-                    session=None,
+                    session=session.id,
                     config=args.config,
                     log_level=args.log_level,
                     log_file=args.log_file
@@ -524,10 +756,21 @@ class PyCodeCLI:
 
         return 0
 
-    async def run(self, argv: Optional[list[str]] = None) -> int:
-        """Main entry point"""
+    def parse_args(self, argv: Optional[list[str]] = None) -> argparse.Namespace:
+        """Parse argv and apply the global options (config path, logging)"""
+        from ..logging import configure_logging, LogLevel
+
+        if argv is None:
+            argv = self.argv
+        else:
+            self.command = _sniff_subcommand(argv)
+
         args = self.parser.parse_args(argv)
 
+        if args.config != self._config_path:
+            self._config_path = args.config
+            self._config_manager = None
+
         # Configure logging
         log_level = LogLevel(args.log_level)
         configure_logging(
@@ -535,12 +778,38 @@ class PyCodeCLI:
             log_file=args.log_file
         )
 
-        # Handle commands
+        return args
+
+    def run_sync(self, args: argparse.Namespace) -> int:
+        """Handle commands that don't need an event loop"""
         if not args.command:
             # No command - show help
             self.parser.print_help()
             return 0
 
+        if args.command == "config":
+            return self.show_config_path(args)
+
+        elif args.command == "providers":
+            return self.list_providers(args)
+
+        elif args.command == "models":
+            return self.list_models(args)
+
+        return 0
+
+    async def _run_async(self, args: argparse.Namespace) -> int:
+        """Handle commands that need the event loop"""
+        try:
+            return await self._dispatch_async(args)
+        finally:
+            # Close the shared provider HTTP client, if a provider opened it
+            http = sys.modules.get("pycode.providers._http")
+            if http is not None:
+                await http.close_http_client()
+
+    async def _dispatch_async(self, args: argparse.Namespace) -> int:
+        """Dispatch a command that needs the event loop"""
         if args.command == "run":
             return await self.run_agent(args)
 
@@ -561,32 +830,40 @@ class PyCodeCLI:
                 return await self.show_config(args)
             elif args.config_command == "init":
                 return await self.init_config(args)
-            elif args.config_command == "path":
-                return self.show_config_path(args)
-
-        elif args.command == "providers":
-            return self.list_providers(args)
-
-        elif args.command == "models":
-            return self.list_models(args)
 
         elif args.command == "repl":
             return await self.run_repl(args)
 
         return 0
 
+    async def run(self, argv: Optional[list[str]] = None) -> int:
+        """Main entry point"""
+        args = self.parse_args(argv)
+
+        if _is_sync_command(args):
+            return self.run_sync(args)
+
+        return await self._run_async(args)
+
 
 def main(argv: Optional[list[str]] = None):
     """Entry point for CLI"""
-    import os
-
-    cli = PyCodeCLI()
+    # Answer a bare version request without building the CLI at all
+    if (sys.argv[1:] if argv is None else argv) in (["--version"], ["-V"]):
+        print(f"PyCode {__version__}")
+        sys.exit(0)
 
-    # Add import for os module at the top of run_agent method
-    # (This is needed for the os.getenv call)
+    cli = PyCodeCLI(argv)
 
     try:
-        exit_code = asyncio.run(cli.run(argv))
+        args = cli.parse_args(argv)
+
+        # Only start an event loop for commands that await something
+        if _is_sync_command(args):
+            exit_code = cli.run_sync(args)
+        else:
+            exit_code = run(cli._run_async(args))
+
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\nInterrupted by user")
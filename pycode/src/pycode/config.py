@@ -6,18 +6,60 @@ Allows customization of agents, tools, models, and runtime settings.
 Supports environment variable substitution in config files.
 """
 
+import functools
 import os
 import re
 from pathlib import Path
-from typing import Any, Literal
-from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Literal, Mapping
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 import yaml
 
-from .logging import get_logger, LogLevel
+from .logging import get_logger, LogLevel, PyCodeLogger
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+# ${VAR_NAME} or ${VAR_NAME:default}
+_ENV_VAR_RE = re.compile(r'\$\{([^}:]+)(?::([^}]*))?\}')
+
+
+def _replace_var(
+    match: re.Match[str],
+    env: Mapping[str, str],
+    logger: PyCodeLogger,
+    debug_enabled: bool,
+) -> str:
+    """Replacement for one ${VAR} / ${VAR:default} match of _ENV_VAR_RE"""
+    var_name = match.group(1)
+    default_value = match.group(2) if match.group(2) is not None else ""
+
+    env_value = env.get(var_name)
+    if env_value is None:
+        if default_value:
+            if debug_enabled:
+                logger.debug(
+                    f"Using default value for {var_name}",
+                    variable=var_name,
+                    default=default_value
+                )
+            return default_value
+        else:
+            logger.warning(
+                f"Environment variable not set: {var_name}",
+                variable=var_name
+            )
+            return ""
+    return env_value
 
 
 class ModelConfig(BaseModel):
     """Model configuration"""
+
+    model_config = ConfigDict(frozen=True)
+
     provider: str = "anthropic"
     model_id: str = "claude-3-5-sonnet-20241022"
     temperature: float = 0.7
@@ -36,6 +78,9 @@ class AgentConfigSettings(BaseModel):
 
 class RuntimeConfig(BaseModel):
     """Runtime configuration"""
+
+    model_config = ConfigDict(frozen=True)
+
     verbose: bool = True
     log_level: str = "normal"  # quiet, normal, verbose, debug
     log_file: str | None = None
@@ -49,11 +94,22 @@ class RuntimeConfig(BaseModel):
 
 class ProviderSettings(BaseModel):
     """Provider configuration"""
+
+    model_config = ConfigDict(frozen=True)
+
     api_key: str | None = None
     base_url: str | None = None
     timeout: int = 60
 
 
+# Tools enabled when the config doesn't list any
+_DEFAULT_TOOLS = (
+    "write", "read", "edit", "bash", "grep", "glob", "ls",
+    "multiedit", "git", "webfetch", "snapshot", "patch",
+    "ask", "todo", "codesearch",
+)
+
+
 class PyCodeConfig(BaseModel):
     """Main PyCode configuration"""
 
@@ -73,21 +129,86 @@ class PyCodeConfig(BaseModel):
     storage_path: str = "~/.pycode/storage"
 
     # Tool settings
-    enabled_tools: list[str] = Field(default_factory=lambda: [
-        "write", "read", "edit", "bash", "grep", "glob", "ls",
-        "multiedit", "git", "webfetch", "snapshot", "patch",
-        "ask", "todo", "codesearch"
-    ])
+    enabled_tools: list[str] = Field(default_factory=lambda: list(_DEFAULT_TOOLS))
+
+
+# Built once at import and shared by every load/save
+_CONFIG_ADAPTER = TypeAdapter(PyCodeConfig)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_data() -> dict[str, Any]:
+    """Built-in default configuration, built once and kept as plain data"""
+    return PyCodeConfig(
+        runtime=RuntimeConfig(
+            verbose=True,
+            auto_approve_tools=False,
+            max_iterations=10,
+            doom_loop_threshold=3,
+            doom_loop_detection=True,
+        ),
+        default_model=ModelConfig(
+            provider="ollama",
+            model_id="llama3.2:latest",
+            temperature=0.7,
+            max_tokens=4096,
+        ),
+        agents={
+            "build": AgentConfigSettings(
+                name="build",
+                model=ModelConfig(
+                    provider="ollama",
+                    model_id="llama3.2:latest",
+                ),
+                enabled_tools=[
+                    "write", "read", "edit", "bash", "grep", "glob",
+                    "multiedit", "git", "webfetch", "snapshot", "patch"
+                ],
+                edit_permission="allow",
+                bash_permissions={"*": "allow"},
+                max_iterations=10,
+            ),
+            "plan": AgentConfigSettings(
+                name="plan",
+                model=ModelConfig(
+                    provider="ollama",
+                    model_id="llama3.2:latest",
+                ),
+                enabled_tools=["read", "grep", "glob", "ls", "codesearch"],
+                edit_permission="deny",
+                bash_permissions={"*": "deny"},
+                max_iterations=5,
+            ),
+        },
+        providers={
+            "ollama": ProviderSettings(
+                api_key=None,  # Not needed for local Ollama
+                base_url="http://localhost:11434",
+                timeout=120,
+            ),
+            "anthropic": ProviderSettings(
+                api_key=None,  # Load from env
+                base_url=None,
+                timeout=60,
+            ),
+            "openai": ProviderSettings(
+                api_key=None,  # Load from env
+                base_url=None,
+                timeout=60,
+            ),
+        },
+        storage_path="~/.pycode/storage",
+    ).model_dump()
 
 
 class ConfigManager:
     """Manages PyCode configuration"""
 
-    DEFAULT_CONFIG_LOCATIONS = [
-        Path.home() / ".pycode" / "config.yaml",
-        Path.cwd() / ".pycode.yaml",
-        Path.cwd() / "pycode.yaml",
-    ]
+    # Parsed configs shared by every manager in the process:
+    # resolved config path -> (file mtime_ns, config)
+    # Managers get deep copies, so changing one manager's config never
+    # reaches another's
+    _loaded: dict[str, tuple[int, "PyCodeConfig"]] = {}
 
     def __init__(self, config_path: Path | None = None):
         """Initialize config manager
@@ -97,17 +218,35 @@ class ConfigManager:
         """
         self.config_path = config_path
         self._config: PyCodeConfig | None = None
+        # File self._config was loaded from and its mtime_ns at the time
+        self._config_file: Path | None = None
+        self._config_mtime_ns: int | None = None
+        # (config, its dump) for as_dict()
+        self._dict_cache: tuple[PyCodeConfig, dict[str, Any]] | None = None
         self.logger = get_logger()
 
+    @property
+    def DEFAULT_CONFIG_LOCATIONS(self) -> tuple[Path, ...]:
+        """Config file search order, relative to the current home and cwd
+
+        Built on access so a changed working directory is honoured.
+        """
+        cwd = Path.cwd()
+        return (
+            Path.home() / ".pycode" / "config.yaml",
+            cwd / ".pycode.yaml",
+            cwd / "pycode.yaml",
+        )
+
     def _find_config_file(self) -> Path | None:
         """Find config file in default locations"""
         for path in self.DEFAULT_CONFIG_LOCATIONS:
-            if path.exists():
+            if os.path.exists(path):
                 return path
         return None
 
     def _substitute_env_vars(self, value: Any) -> Any:
-        """Recursively substitute environment variables in config values
+        """Substitute environment variables in config values
 
         Supports ${VAR_NAME} and ${VAR_NAME:default} syntax.
 
@@ -115,62 +254,80 @@ class ConfigManager:
             api_key: ${ANTHROPIC_API_KEY}
             api_key: ${ANTHROPIC_API_KEY:sk-ant-default}
             base_url: ${API_URL:https://api.anthropic.com}
+
+        Dicts and lists are walked iteratively and updated in place.
         """
+        if not isinstance(value, (str, dict, list)):
+            return value
+
+        # One replacement callable for the whole walk; debug level checked once
+        replace_var = functools.partial(
+            _replace_var,
+            env=os.environ,
+            logger=self.logger,
+            debug_enabled=self.logger.is_debug_enabled(),
+        )
+
         if isinstance(value, str):
-            # Pattern: ${VAR_NAME} or ${VAR_NAME:default}
-            pattern = r'\$\{([^}:]+)(?::([^}]*))?\}'
-
-            def replace_var(match):
-                var_name = match.group(1)
-                default_value = match.group(2) if match.group(2) is not None else ""
-
-                env_value = os.getenv(var_name)
-                if env_value is None:
-                    if default_value:
-                        self.logger.debug(
-                            f"Using default value for {var_name}",
-                            variable=var_name,
-                            default=default_value
-                        )
-                        return default_value
-                    else:
-                        self.logger.warning(
-                            f"Environment variable not set: {var_name}",
-                            variable=var_name
-                        )
-                        return ""
-                return env_value
-
-            return re.sub(pattern, replace_var, value)
-
-        elif isinstance(value, dict):
-            return {k: self._substitute_env_vars(v) for k, v in value.items()}
-
-        elif isinstance(value, list):
-            return [self._substitute_env_vars(item) for item in value]
+            return _ENV_VAR_RE.sub(replace_var, value) if "$" in value else value
+
+        stack = [value]
+        while stack:
+            container = stack.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, item in items:
+                if isinstance(item, str):
+                    # Most values reference no variables at all
+                    if "$" in item:
+                        container[key] = _ENV_VAR_RE.sub(replace_var, item)
+                elif isinstance(item, (dict, list)):
+                    stack.append(item)
 
         return value
 
     def load(self) -> PyCodeConfig:
-        """Load configuration from file or use defaults"""
+        """Load configuration from file or use defaults
+
+        The loaded config is reused until the file it came from changes
+        (checked with a single stat of that file).
+        """
         if self._config:
-            return self._config
+            if self._config_file is None:
+                return self._config
+            if self._file_mtime_ns(self._config_file) == self._config_mtime_ns:
+                return self._config
+            # File changed since we loaded it
+            self.invalidate()
 
         # Try to load from file
         config_file = self.config_path or self._find_config_file()
 
         if config_file and config_file.exists():
+            # Another manager may already have parsed this exact file version
+            cache_key = str(config_file.resolve())
+            mtime_ns = config_file.stat().st_mtime_ns
+            cached = ConfigManager._loaded.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                self._config = cached[1].model_copy(deep=True)
+                self._config_file, self._config_mtime_ns = config_file, mtime_ns
+                return self._config
+
             try:
                 self.logger.debug("Loading config", file=str(config_file))
 
-                with open(config_file, "r") as f:
-                    config_data = yaml.safe_load(f) or {}
+                # One read; libyaml decodes the bytes itself
+                config_bytes = config_file.read_bytes()
+                config_data = yaml.load(config_bytes, Loader=_SafeLoader) or {}
 
                 # Substitute environment variables
                 config_data = self._substitute_env_vars(config_data)
 
                 # Validate and create config
-                self._config = PyCodeConfig.model_validate(config_data)
+                self._config = _CONFIG_ADAPTER.validate_python(config_data)
+                ConfigManager._loaded[cache_key] = (
+                    mtime_ns, self._config.model_copy(deep=True)
+                )
+                self._config_file, self._config_mtime_ns = config_file, mtime_ns
 
                 self.logger.info("Configuration loaded", file=str(config_file))
                 return self._config
@@ -208,6 +365,9 @@ class ConfigManager:
                 )
                 self.logger.warning("Using default configuration")
 
+            # Remember the file that failed, so an edit fixing it is re-read
+            self._config_file, self._config_mtime_ns = config_file, mtime_ns
+
         else:
             self.logger.debug("No config file found, using defaults")
 
@@ -215,6 +375,31 @@ class ConfigManager:
         self._config = self._get_default_config()
         return self._config
 
+    def invalidate(self) -> None:
+        """Drop the cached configuration so the next load() re-reads the file"""
+        self._config = None
+        self._config_file = None
+        self._config_mtime_ns = None
+
+    @staticmethod
+    def _file_mtime_ns(path: Path) -> int | None:
+        """mtime_ns of path, or None if it can't be stat'ed"""
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Loaded configuration as a plain dict (None values left out)
+
+        The dump is reused for as long as load() returns the same config.
+        """
+        config = self.load()
+        if self._dict_cache is None or self._dict_cache[0] is not config:
+            self._dict_cache = (config, config.model_dump(exclude_none=True))
+
+        return self._dict_cache[1]
+
     def save(self, config: PyCodeConfig, path: Path | None = None) -> None:
         """Save configuration to file
 
@@ -228,75 +413,23 @@ class ConfigManager:
         save_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Convert to dict and save as YAML
-        config_dict = config.model_dump(exclude_none=True)
+        config_dict = _CONFIG_ADAPTER.dump_python(config, exclude_none=True)
 
-        with open(save_path, "w") as f:
-            yaml.safe_dump(config_dict, f, default_flow_style=False, sort_keys=False)
+        # Render the whole document first, then write it in one go
+        config_text = yaml.dump(
+            config_dict, Dumper=_SafeDumper, default_flow_style=False, sort_keys=False
+        )
+        save_path.write_bytes(config_text.encode("utf-8"))
 
         self.logger.info("Configuration saved", path=str(save_path))
 
     def _get_default_config(self) -> PyCodeConfig:
-        """Get default configuration"""
-        return PyCodeConfig(
-            runtime=RuntimeConfig(
-                verbose=True,
-                auto_approve_tools=False,
-                max_iterations=10,
-                doom_loop_threshold=3,
-                doom_loop_detection=True,
-            ),
-            default_model=ModelConfig(
-                provider="ollama",
-                model_id="llama3.2:latest",
-                temperature=0.7,
-                max_tokens=4096,
-            ),
-            agents={
-                "build": AgentConfigSettings(
-                    name="build",
-                    model=ModelConfig(
-                        provider="ollama",
-                        model_id="llama3.2:latest",
-                    ),
-                    enabled_tools=[
-                        "write", "read", "edit", "bash", "grep", "glob",
-                        "multiedit", "git", "webfetch", "snapshot", "patch"
-                    ],
-                    edit_permission="allow",
-                    bash_permissions={"*": "allow"},
-                    max_iterations=10,
-                ),
-                "plan": AgentConfigSettings(
-                    name="plan",
-                    model=ModelConfig(
-                        provider="ollama",
-                        model_id="llama3.2:latest",
-                    ),
-                    enabled_tools=["read", "grep", "glob", "ls", "codesearch"],
-                    edit_permission="deny",
-                    bash_permissions={"*": "deny"},
-                    max_iterations=5,
-                ),
-            },
-            providers={
-                "ollama": ProviderSettings(
-                    api_key=None,  # Not needed for local Ollama
-                    base_url="http://localhost:11434",
-                    timeout=120,
-                ),
-                "anthropic": ProviderSettings(
-                    api_key=None,  # Load from env
-                    base_url=None,
-                    timeout=60,
-                ),
-                "openai": ProviderSettings(
-                    api_key=None,  # Load from env
-                    base_url=None,
-                    timeout=60,
-                ),
-            },
-            storage_path="~/.pycode/storage",
-        )
+        """Get default configuration
+
+        Validated from the cached default data, so each call still returns
+        an independent config object.
+        """
+        return _CONFIG_ADAPTER.validate_python(_default_config_data())
 
     def create_default_config(self, path: Path | None = None) -> None:
         """Create a default configuration file
@@ -336,8 +469,8 @@ class ConfigManager:
         return config.providers.get(provider_name)
 
 
-# Global config manager instance
-_config_manager: ConfigManager | None = None
+# Global config manager instances, keyed by resolved config path
+_config_managers: dict[str | None, ConfigManager] = {}
 
 
 def get_config_manager(config_path: Path | None = None) -> ConfigManager:
@@ -347,12 +480,13 @@ def get_config_manager(config_path: Path | None = None) -> ConfigManager:
         config_path: Optional path to config file
 
     Returns:
-        ConfigManager instance
+        ConfigManager instance shared by all callers asking for the same file
     """
-    global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager(config_path)
-    return _config_manager
+    key = str(Path(config_path).resolve()) if config_path else None
+    manager = _config_managers.get(key)
+    if manager is None:
+        manager = _config_managers[key] = ConfigManager(config_path)
+    return manager
 
 
 def load_config(config_path: Path | None = None) -> PyCodeConfig:
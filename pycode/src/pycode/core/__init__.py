@@ -1,13 +1,14 @@
 """Core data structures and utilities"""
 
 from .identifier import Identifier
-from .message import Message, MessagePart, TextPart, ToolPart, ReasoningPart, ToolState
+from .message import Message, MessagePart, Part, TextPart, ToolPart, ReasoningPart, ToolState
 from .session import Session
 
 __all__ = [
     "Identifier",
     "Message",
     "MessagePart",
+    "Part",
     "TextPart",
     "ToolPart",
     "ReasoningPart",
@@ -1,8 +1,65 @@
 """Identifier generation system using ULIDs"""
 
+import os
+import re
+import threading
 import time
+from base64 import b32encode
 from typing import Literal
-from ulid import ULID
+
+# RFC 4648 base32 alphabet -> Crockford base32 (the ULID alphabet)
+_CROCKFORD = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", b"0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+)
+# 26 Crockford base32 characters, the first one at most 7 (128 bits)
+_ULID_RE = re.compile(r"[0-7][0-9A-HJKMNP-TV-Z]{25}")
+# Crockford base32 -> the digits int(..., 32) reads
+_CROCKFORD_DIGITS = str.maketrans(
+    "0123456789ABCDEFGHJKMNPQRSTVWXYZ", "0123456789ABCDEFGHIJKLMNOPQRSTUV"
+)
+
+
+def _ulid_str(timestamp_ms: int, randomness: int | None = None) -> str:
+    """
+    Format a ULID string straight from a millisecond timestamp.
+
+    48-bit timestamp + 80 random bits, Crockford base32 encoded to 26 chars.
+    Four zero bytes of padding make the 128 bits line up with b32encode's
+    40-bit groups; the six leading (all-zero) characters are then dropped.
+    """
+    random_bytes = os.urandom(10) if randomness is None else randomness.to_bytes(10, "big")
+    raw = b"\0\0\0\0" + timestamp_ms.to_bytes(6, "big") + random_bytes
+    return b32encode(raw)[6:].translate(_CROCKFORD).decode("ascii")
+
+
+# Timestamp and random part of the last ascending ULID
+_last_ascending = (-1, 0)
+_ascending_lock = threading.Lock()
+
+
+def _ascending_ulid_str() -> str:
+    """
+    ULID string for the current time, greater than the previous one
+
+    Within the same millisecond (or if the clock steps back) the previous
+    random part is incremented instead of drawing a new one, so IDs made
+    one after another sort in creation order.
+    """
+    global _last_ascending
+
+    timestamp_ms = time.time_ns() // 1_000_000
+    with _ascending_lock:
+        last_timestamp, last_randomness = _last_ascending
+        if timestamp_ms > last_timestamp:
+            randomness = int.from_bytes(os.urandom(10), "big")
+        else:
+            timestamp_ms, randomness = last_timestamp, last_randomness + 1
+            if randomness >> 80:
+                # Random part exhausted within one millisecond
+                timestamp_ms, randomness = timestamp_ms + 1, 0
+        _last_ascending = (timestamp_ms, randomness)
+
+    return _ulid_str(timestamp_ms, randomness)
 
 
 class Identifier:
@@ -16,8 +73,7 @@ class Identifier:
     @staticmethod
     def ascending(prefix: Literal["message", "part", "tool"] = "message") -> str:
         """Generate ascending (forward-chronological) ID"""
-        ulid = ULID()
-        return f"{prefix}_{ulid}"
+        return f"{prefix}_{_ascending_ulid_str()}"
 
     @staticmethod
     def descending(prefix: Literal["session"] = "session", custom_id: str | None = None) -> str:
@@ -26,12 +82,10 @@ class Identifier:
             return f"{prefix}_{custom_id}"
 
         # Invert timestamp for reverse chronological sorting
-        timestamp_ms = int(time.time() * 1000)
+        timestamp_ms = time.time_ns() // 1_000_000
         inverted_timestamp = 0xFFFFFFFFFFFF - (timestamp_ms & 0xFFFFFFFFFFFF)
 
-        # Create ULID with inverted timestamp
-        ulid = ULID.from_timestamp(inverted_timestamp / 1000)
-        return f"{prefix}_{ulid}"
+        return f"{prefix}_{_ulid_str(inverted_timestamp)}"
 
     @staticmethod
     def extract_timestamp(identifier: str) -> int:
@@ -40,9 +94,12 @@ class Identifier:
         if len(parts) != 2:
             raise ValueError(f"Invalid identifier format: {identifier}")
 
-        ulid_str = parts[1]
-        ulid = ULID.from_str(ulid_str)
-        return int(ulid.timestamp().timestamp() * 1000)
+        ulid_str = parts[1].upper()
+        if not _ULID_RE.fullmatch(ulid_str):
+            raise ValueError(f"Invalid identifier format: {identifier}")
+
+        # The first 10 characters hold the 48-bit timestamp
+        return int(ulid_str[:10].translate(_CROCKFORD_DIGITS), 32)
 
     @staticmethod
     def compare(id1: str, id2: str) -> int:
@@ -50,6 +107,4 @@ class Identifier:
         Compare two identifiers.
         Returns: -1 if id1 < id2, 0 if equal, 1 if id1 > id2
         """
-        if id1 == id2:
-            return 0
-        return -1 if id1 < id2 else 1
+        return (id1 > id2) - (id1 < id2)
@@ -1,23 +1,37 @@
 """Message and Part data structures"""
 
 from __future__ import annotations
-from typing import Literal, Any
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
+from typing import Annotated, Literal, Any, Union
 from pydantic import BaseModel, Field, ConfigDict
 from .identifier import Identifier
 
 
-class MessagePart(BaseModel):
-    """Base class for message parts"""
+def _now_ms() -> int:
+    """Current time in milliseconds since the epoch"""
+    return time.time_ns() // 1_000_000
 
-    model_config = ConfigDict(extra="forbid")
 
-    id: str = Field(default_factory=lambda: Identifier.ascending("part"))
+@dataclass(slots=True, kw_only=True)
+class MessagePart:
+    """
+    Base class for message parts.
+
+    Parts are plain slotted dataclasses: they are built on the agent's hot
+    path, so constructing one does no validation. Pydantic still validates
+    them (with extra="forbid") when a Message is loaded from storage.
+    """
+
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
+    id: str = field(default_factory=lambda: Identifier.ascending("part"))
     session_id: str
     message_id: str
     type: str
 
 
+@dataclass(slots=True, kw_only=True)
 class TextPart(MessagePart):
     """Text content part"""
 
@@ -25,9 +39,10 @@ class TextPart(MessagePart):
     text: str
     synthetic: bool = False  # Auto-generated vs user-provided
     ignored: bool = False  # Excluded from context
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True, kw_only=True)
 class FilePart(MessagePart):
     """File attachment part"""
 
@@ -38,6 +53,7 @@ class FilePart(MessagePart):
     source: dict[str, Any] | None = None  # Where file came from
 
 
+@dataclass(slots=True, kw_only=True)
 class AgentPart(MessagePart):
     """Agent invocation part"""
 
@@ -46,6 +62,7 @@ class AgentPart(MessagePart):
     source: dict[str, Any] | None = None
 
 
+@dataclass(slots=True, kw_only=True)
 class ToolPart(MessagePart):
     """Tool execution part"""
 
@@ -67,6 +84,7 @@ class ToolState(BaseModel):
     time_end: int | None = None
 
 
+@dataclass(slots=True, kw_only=True)
 class ReasoningPart(MessagePart):
     """Extended thinking part (e.g., Claude reasoning)"""
 
@@ -74,7 +92,15 @@ class ReasoningPart(MessagePart):
     text: str
     time_start: int
     time_end: int | None = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+# Any concrete part, tagged by its "type" field so validation goes straight
+# to the matching class instead of trying each one in turn
+Part = Annotated[
+    Union[TextPart, FilePart, AgentPart, ToolPart, ReasoningPart],
+    Field(discriminator="type"),
+]
 
 
 class Message(BaseModel):
@@ -88,7 +114,7 @@ class Message(BaseModel):
     id: str = Field(default_factory=lambda: Identifier.ascending("message"))
     session_id: str
     role: Literal["user", "assistant"]
-    parts: list[MessagePart] = Field(default_factory=list)
+    parts: list[Part] = Field(default_factory=list)
 
     # Assistant-specific fields
     agent: str | None = None  # Which agent generated this
@@ -101,13 +127,13 @@ class Message(BaseModel):
     system: str | None = None  # Custom system prompt override
 
     # Timestamps
-    time_created: int = Field(default_factory=lambda: int(datetime.now().timestamp() * 1000))
-    time_updated: int = Field(default_factory=lambda: int(datetime.now().timestamp() * 1000))
+    time_created: int = Field(default_factory=_now_ms)
+    time_updated: int = Field(default_factory=_now_ms)
 
     def add_part(self, part: MessagePart) -> None:
         """Add a part to this message"""
         self.parts.append(part)
-        self.time_updated = int(datetime.now().timestamp() * 1000)
+        self.time_updated = _now_ms()
 
     def get_text_parts(self) -> list[TextPart]:
         """Get all text parts"""
@@ -119,4 +145,10 @@ class Message(BaseModel):
 
     def get_text_content(self) -> str:
         """Get combined text from all text parts"""
-        return "\n".join(p.text for p in self.get_text_parts() if not p.ignored)
+        # One pass over parts, without building get_text_parts()' list
+        texts = []
+        append = texts.append
+        for part in self.parts:
+            if isinstance(part, TextPart) and not part.ignored:
+                append(part.text)
+        return "\n".join(texts)
@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 from typing import Any
-from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 from .identifier import Identifier
-from .message import Message
+from .message import Message, _now_ms
 
 
 class Session(BaseModel):
@@ -24,8 +23,8 @@ class Session(BaseModel):
 
     # Metadata
     version: str = "0.1.0"
-    time_created: int = Field(default_factory=lambda: int(datetime.now().timestamp() * 1000))
-    time_updated: int = Field(default_factory=lambda: int(datetime.now().timestamp() * 1000))
+    time_created: int = Field(default_factory=_now_ms)
+    time_updated: int = Field(default_factory=_now_ms)
     time_archived: int | None = None
 
     # Summary statistics
@@ -39,11 +38,11 @@ class Session(BaseModel):
 
     def touch(self) -> None:
         """Update the last-activity timestamp"""
-        self.time_updated = int(datetime.now().timestamp() * 1000)
+        self.time_updated = _now_ms()
 
     def archive(self) -> None:
         """Mark session as archived (soft delete)"""
-        self.time_archived = int(datetime.now().timestamp() * 1000)
+        self.time_archived = _now_ms()
 
     def is_archived(self) -> bool:
         """Check if session is archived"""
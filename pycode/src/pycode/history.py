@@ -5,54 +5,241 @@ Handles loading, saving, and managing conversation history.
 Critical for resuming sessions and maintaining context.
 """
 
-import json
+import asyncio
+import functools
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
+from ._json import json_dumps, json_loads
 from .core import Message, Session
+from .logging import get_logger
 from .storage import Storage
 
 
+# Most (session, max_messages) conversations kept per MessageHistory
+_CONVERSATION_CACHE_SIZE = 64
+
+# Most converted log lines kept per MessageHistory
+_CONVERTED_LINE_CACHE_SIZE = 4096
+
+# Most message token counts kept per ContextManager
+_TOKEN_CACHE_SIZE = 4096
+
+# Part types whose text goes into the LLM conversation
+_TEXT_PART_TYPES = frozenset({"text", "reasoning"})
+
+# Message id at the start of a log line, read without parsing the JSON
+_LINE_ID_RE = re.compile(rb'\{"id":\s*"([^"]+)"')
+
+
+def _latest_lines(lines: list[bytes]) -> list[bytes]:
+    """
+    Last saved version of each message, in the order messages were first saved
+
+    A message is appended again every time it is re-saved (e.g. an assistant
+    message growing over several tool iterations), so later lines win.
+    """
+    latest: dict[bytes, bytes] = {}
+    for line in lines:
+        match = _LINE_ID_RE.match(line)
+        if match is not None:
+            latest[match.group(1)] = line
+    return list(latest.values())
+
+
+def _read_legacy_message(path: str) -> Any:
+    """Parse one legacy message file"""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def _read_legacy_messages(paths: list[str]) -> tuple[list[tuple[str, Any]], list[str]]:
+    """
+    Parse legacy message files concurrently
+
+    Returns (path, message) for each file that parsed, in the order of
+    paths, and the paths of the files that couldn't be read or parsed.
+    """
+    messages: list[tuple[str, Any]] = []
+    failed: list[str] = []
+
+    # open/read release the GIL, so the reads overlap on disk
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as pool:
+        futures = [pool.submit(_read_legacy_message, path) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                messages.append((path, future.result()))
+            except Exception:
+                failed.append(path)
+
+    return messages, failed
+
+
+@functools.lru_cache(maxsize=256)
+def _session_dir(base_path: Path, session_id: str) -> Path:
+    """sessions/<id without "session_"> under base_path, built once per session"""
+    return base_path / "sessions" / session_id.removeprefix("session_")
+
+
 class MessageHistory:
-    """Manages message history for sessions"""
+    """
+    Manages message history for sessions
+
+    Each session's messages live in one append-only log,
+    sessions/<session>/messages.jsonl, one JSON message per line.
+    """
 
     def __init__(self, storage: Storage | None = None):
         self.storage = storage or Storage()
+        # (session_id, max_messages) -> (log mtime_ns, log size, conversation)
+        self._conversations: dict[
+            tuple[str, int], tuple[int, int, tuple[dict[str, Any], ...]]
+        ] = {}
+        # blake2b digest of a log line -> the LLM entries it converts to
+        self._converted_lines: dict[bytes, tuple[dict[str, Any], ...]] = {}
+
+    def _session_dir(self, session_id: str) -> Path:
+        """Directory holding a session's message log"""
+        return _session_dir(self.storage.base_path, session_id)
+
+    def _log_key(self, session_id: str) -> list[str]:
+        """Storage key of a session's message log"""
+        return ["sessions", _session_dir(self.storage.base_path, session_id).name, "messages"]
+
+    async def _migrate_legacy_messages(self, session_id: str) -> None:
+        """Fold an older one-file-per-message directory into the message log"""
+        legacy_dir = self._session_dir(session_id) / "messages"
+        if not legacy_dir.is_dir():
+            return
+
+        log_key = self._log_key(session_id)
+        with os.scandir(legacy_dir) as entries:
+            all_names = [entry.name for entry in entries]
+        names = sorted(name for name in all_names if name.endswith(".json"))
+        # Files set aside by an earlier run; they keep the directory alive
+        has_corrupt = any(name.endswith(".corrupt") for name in all_names)
+
+        failed: list[str] = []
+        if names:
+            paths = [os.path.join(legacy_dir, name) for name in names]
+            messages, failed = await asyncio.to_thread(_read_legacy_messages, paths)
+            for path, msg_data in messages:
+                await self.storage.append(log_key, msg_data)
+                # Gone once it is in the log, so a later run can't add it twice
+                os.unlink(path)
+
+        if failed:
+            # Set the unreadable files aside rather than deleting them; they
+            # no longer end in .json, so they aren't retried on every read
+            for path in failed:
+                os.replace(path, path + ".corrupt")
+            get_logger().warning(
+                "Could not migrate legacy messages, renamed to *.corrupt",
+                session=session_id,
+                files=", ".join(os.path.basename(path) for path in failed),
+            )
+            return
+
+        if not has_corrupt:
+            await asyncio.to_thread(shutil.rmtree, legacy_dir)
+
+    async def _message_lines(self, session_id: str) -> list[bytes]:
+        """Raw JSON lines of the latest version of every message"""
+        await self._migrate_legacy_messages(session_id)
+        return _latest_lines(await self.storage.read_lines(self._log_key(session_id)))
+
+    async def _recent_message_lines(self, session_id: str, n: int) -> list[bytes]:
+        """
+        Raw JSON lines of the latest version of the last n messages
 
-    async def save_message(self, session_id: str, message: Message) -> None:
-        """Save a message to history"""
-        # Create messages directory for session
-        messages_key = ["sessions", session_id.replace("session_", ""), "messages", message.id]
+        The log is read backwards and reading stops after n distinct
+        messages, so the cost doesn't grow with the length of the session.
+        This relies on a message only being re-saved while it is the newest
+        one in the session, which is how the runner saves.
+        """
+        await self._migrate_legacy_messages(session_id)
+
+        seen: set[bytes] = set()
+        lines: list[bytes] = []
+        for line in self.storage.iter_lines_reversed(self._log_key(session_id)):
+            match = _LINE_ID_RE.match(line)
+            if match is None or match.group(1) in seen:
+                continue
 
-        # Save message
-        await self.storage.write(messages_key, message.model_dump())
+            seen.add(match.group(1))
+            lines.append(line)
+            if len(lines) == n:
+                break
 
-    async def load_messages(self, session_id: str, limit: int | None = None) -> list[Message]:
-        """Load messages for a session"""
-        session_dir = self.storage.base_path / "sessions" / session_id.replace("session_", "") / "messages"
+        lines.reverse()
+        return lines
 
-        if not session_dir.exists():
-            return []
+    def _forget_conversations(self, session_id: str) -> None:
+        """Drop cached LLM conversations for a session"""
+        for key in [key for key in self._conversations if key[0] == session_id]:
+            del self._conversations[key]
 
-        # Get all message files
-        message_files = sorted(session_dir.glob("*.json"))
+    async def save_message(self, session_id: str, message: Message) -> None:
+        """Save a message to history (appends to the session's message log)"""
+        await self._migrate_legacy_messages(session_id)
+        await self.storage.append(self._log_key(session_id), message)
+        self._forget_conversations(session_id)
 
-        # Apply limit
+    async def load_messages(self, session_id: str, limit: int | None = None) -> list[Message]:
+        """Load messages for a session"""
+        # With a limit only the tail of the log is read
         if limit:
-            message_files = message_files[-limit:]
+            lines = await self._recent_message_lines(session_id, limit)
+        else:
+            lines = await self._message_lines(session_id)
 
         # Load messages
         messages = []
-        for msg_file in message_files:
+        for line in lines:
             try:
-                with open(msg_file, "r") as f:
-                    msg_data = json.load(f)
-                    messages.append(Message.model_validate(msg_data))
+                messages.append(Message.model_validate_json(line))
             except Exception:
                 # Skip corrupted messages
                 continue
 
         return messages
 
+    async def load_recent_previews(
+        self, session_id: str, n: int = 3, width: int = 100
+    ) -> list[tuple[str, str]]:
+        """
+        Get (role, preview) pairs for the last n messages
+
+        Only the last n messages are read, and the preview is taken from
+        the first text part of the raw JSON without validating the full Message.
+        """
+        lines = await self._recent_message_lines(session_id, n)
+
+        previews = []
+        for line in lines:
+            try:
+                msg_data = json_loads(line)
+            except Exception:
+                # Skip corrupted messages
+                continue
+
+            text = ""
+            for part in msg_data.get("parts", []):
+                if part.get("type") == "text":
+                    text = part.get("text", "")
+                    break
+
+            if len(text) > width:
+                text = text[:width] + "..."
+
+            previews.append((msg_data.get("role", "user"), text))
+
+        return previews
+
     async def get_conversation_for_llm(
         self, session_id: str, max_messages: int = 20
     ) -> list[dict[str, Any]]:
@@ -60,28 +247,83 @@ class MessageHistory:
         Get conversation history formatted for LLM
 
         Returns list of {role: "user"|"assistant", content: str} dicts
+
+        The result is cached until the session's message log changes (same
+        mtime and size), so unchanged history is not re-read or re-converted.
+        Callers get a fresh list but share the message dicts in it.
         """
-        messages = await self.load_messages(session_id, limit=max_messages)
+        try:
+            stat = (self._session_dir(session_id) / "messages.jsonl").stat()
+            log_state = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            log_state = None
+
+        cache_key = (session_id, max_messages)
+        cached = self._conversations.get(cache_key)
+        if cached is not None and log_state is not None and cached[:2] == log_state:
+            return list(cached[2])
 
+        conversation = []
+        for line in await self._recent_message_lines(session_id, max_messages):
+            conversation.extend(self._convert_line(line))
+
+        if log_state is not None:
+            if len(self._conversations) >= _CONVERSATION_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._conversations[next(iter(self._conversations))]
+            self._conversations[cache_key] = (*log_state, tuple(conversation))
+
+        return conversation
+
+    def _convert_line(self, line: bytes) -> tuple[dict[str, Any], ...]:
+        """
+        LLM entries for one raw log line, converted once per line content
+
+        Only messages that are new or were re-saved since the last call get
+        validated and converted; the rest of the history is a cache hit.
+        """
+        digest = hashlib.blake2b(line, digest_size=16).digest()
+        entries = self._converted_lines.get(digest)
+        if entries is not None:
+            return entries
+
+        try:
+            entries = tuple(self._to_llm_conversation([Message.model_validate_json(line)]))
+        except Exception:
+            # Skip corrupted messages
+            entries = ()
+
+        if len(self._converted_lines) >= _CONVERTED_LINE_CACHE_SIZE:
+            # Evict the oldest entry
+            del self._converted_lines[next(iter(self._converted_lines))]
+        self._converted_lines[digest] = entries
+        return entries
+
+    @staticmethod
+    def _to_llm_conversation(messages: list[Message]) -> list[dict[str, Any]]:
+        """Convert messages to LLM {role, content} dicts"""
         conversation = []
         for msg in messages:
             # Convert message to LLM format
             if msg.role == "user":
                 # User message - combine all text parts
-                text_parts = [p.text for p in msg.parts if hasattr(p, "text")]
+                text_parts = [p.text for p in msg.parts if p.type in _TEXT_PART_TYPES]
                 if text_parts:
                     conversation.append({"role": "user", "content": " ".join(text_parts)})
 
             elif msg.role == "assistant":
-                # Assistant message - handle text and tool calls
+                # Assistant message - text and tool calls, plus the tool
+                # results that go back as a user message, in one pass
                 content_blocks = []
+                tool_results = []
 
                 for part in msg.parts:
-                    if hasattr(part, "text"):
+                    part_type = part.type
+                    if part_type in _TEXT_PART_TYPES:
                         # Text part
                         content_blocks.append({"type": "text", "text": part.text})
 
-                    elif hasattr(part, "tool"):
+                    elif part_type == "tool":
                         # Tool part
                         content_blocks.append(
                             {
@@ -91,14 +333,6 @@ class MessageHistory:
                                 "input": part.state.input,
                             }
                         )
-
-                if content_blocks:
-                    conversation.append({"role": "assistant", "content": content_blocks})
-
-                # Add tool results as user message
-                tool_results = []
-                for part in msg.parts:
-                    if hasattr(part, "tool"):
                         tool_results.append(
                             {
                                 "type": "tool_result",
@@ -108,6 +342,9 @@ class MessageHistory:
                             }
                         )
 
+                if content_blocks:
+                    conversation.append({"role": "assistant", "content": content_blocks})
+
                 if tool_results:
                     conversation.append({"role": "user", "content": tool_results})
 
@@ -115,17 +352,64 @@ class MessageHistory:
 
     async def get_message_count(self, session_id: str) -> int:
         """Get total message count for session"""
-        messages = await self.load_messages(session_id)
-        return len(messages)
+        # Counts distinct message ids without parsing the messages
+        return len(await self._message_lines(session_id))
+
+    async def count_messages_bulk(self, session_ids: list[str]) -> dict[str, int]:
+        """Count messages for several sessions
+
+        Returns a dict of session ID -> message count (0 for sessions without
+        messages). The sessions directory is scanned once, off the event
+        loop, and only the logs of the requested sessions are read. No
+        message is parsed, only the id at the start of each line.
+        """
+        return await asyncio.to_thread(self._count_messages, session_ids)
+
+    def _count_messages(self, session_ids: list[str]) -> dict[str, int]:
+        """Blocking body of count_messages_bulk()"""
+        counts = dict.fromkeys(session_ids, 0)
+        wanted = {self._session_dir(session_id).name: session_id for session_id in session_ids}
+
+        try:
+            with os.scandir(self.storage.base_path / "sessions") as entries:
+                session_dirs = [
+                    (wanted[entry.name], entry.path)
+                    for entry in entries
+                    if entry.name in wanted and entry.is_dir()
+                ]
+        except FileNotFoundError:
+            return counts
+
+        for session_id, path in session_dirs:
+            ids = set()
+            for line in self.storage.read_lines_sync(self._log_key(session_id)):
+                match = _LINE_ID_RE.match(line)
+                if match is not None:
+                    ids.add(match.group(1))
+
+            # Legacy per-message files not migrated yet, one message each
+            try:
+                with os.scandir(os.path.join(path, "messages")) as entries:
+                    ids.update(
+                        entry.name.removesuffix(".json").encode()
+                        for entry in entries
+                        if entry.name.endswith(".json")
+                    )
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+
+            counts[session_id] = len(ids)
+
+        return counts
 
     async def clear_history(self, session_id: str) -> None:
         """Clear all messages for a session"""
-        session_dir = self.storage.base_path / "sessions" / session_id.replace("session_", "") / "messages"
+        await self.storage.delete_log(self._log_key(session_id))
+        self._forget_conversations(session_id)
 
-        if session_dir.exists():
-            import shutil
-
-            shutil.rmtree(session_dir)
+        legacy_dir = self._session_dir(session_id) / "messages"
+        if legacy_dir.exists():
+            shutil.rmtree(legacy_dir)
 
     async def get_last_message(self, session_id: str) -> Message | None:
         """Get the most recent message"""
@@ -133,18 +417,53 @@ class MessageHistory:
         return messages[0] if messages else None
 
 
+@functools.lru_cache(maxsize=1)
+def _get_tokenizer() -> Any | None:
+    """tiktoken's cl100k_base encoding, or None when tiktoken isn't usable"""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Not installed, or the encoding couldn't be fetched
+        return None
+
+
 class ContextManager:
     """Manages context and token limits"""
 
+    # Fraction of the token limit a pruned conversation is cut down to
+    PRUNE_TARGET_RATIO = 0.75
+
     def __init__(self, max_tokens: int = 100000):
         self.max_tokens = max_tokens
+        # blake2b digest of a message's JSON -> its token count
+        self._token_cache: dict[bytes, int] = {}
 
     def estimate_tokens(self, text: str) -> int:
         """
-        Rough token estimate
-        ~4 characters per token for English
+        Token estimate
+
+        Counted with tiktoken's cl100k_base BPE when it is installed,
+        otherwise ~4 characters per token for English
         """
-        return len(text) // 4
+        tokenizer = _get_tokenizer()
+        if tokenizer is None:
+            return len(text) // 4
+        return len(tokenizer.encode(text, disallowed_special=()))
+
+    def _message_tokens(self, message: dict[str, Any]) -> int:
+        """Token estimate for one conversation message, counted once per content"""
+        data = json_dumps(message)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+
+        count = self._token_cache.get(digest)
+        if count is None:
+            if len(self._token_cache) >= _TOKEN_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._token_cache[next(iter(self._token_cache))]
+            count = self._token_cache[digest] = self.estimate_tokens(data.decode("utf-8"))
+        return count
 
     def prune_conversation(
         self, conversation: list[dict[str, Any]], target_tokens: int
@@ -155,14 +474,16 @@ class ContextManager:
         Strategy:
         1. Always keep first message (initial context)
         2. Always keep last 5 messages (recent context)
-        3. Remove middle messages if needed
+        3. Remove the oldest middle messages until the rest fits in
+           PRUNE_TARGET_RATIO of the limit, leaving headroom so the next few
+           turns don't have to prune (and shift the prompt) again
         """
         if not conversation:
             return []
 
-        # Estimate current token count
-        conv_text = json.dumps(conversation)
-        current_tokens = self.estimate_tokens(conv_text)
+        # Estimate current token count, message by message
+        token_counts = [self._message_tokens(message) for message in conversation]
+        current_tokens = sum(token_counts)
 
         if current_tokens <= target_tokens:
             return conversation
@@ -172,17 +493,22 @@ class ContextManager:
             # Too short to prune
             return conversation
 
-        # Keep first message and last 5
-        pruned = [conversation[0]] + conversation[-5:]
+        # Drop messages from index 1 on, subtracting their counts as we go
+        budget = target_tokens * self.PRUNE_TARGET_RATIO
+        last_droppable = len(conversation) - 5
+        keep_from = 1
+        while keep_from < last_droppable and current_tokens > budget:
+            current_tokens -= token_counts[keep_from]
+            keep_from += 1
 
         # Add summary message
-        removed_count = len(conversation) - len(pruned)
+        removed_count = keep_from - 1
         summary = {
             "role": "user",
             "content": f"[{removed_count} messages removed to save context]",
         }
 
-        return [conversation[0], summary] + conversation[-5:]
+        return [conversation[0], summary] + conversation[keep_from:]
 
     async def compress_history(
         self, history: MessageHistory, session_id: str, max_tokens: int | None = None
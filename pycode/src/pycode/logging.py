@@ -20,6 +20,15 @@ class LogLevel(Enum):
     DEBUG = "debug"      # Full debug output
 
 
+# Verbosity -> level of the underlying logger and console handler
+_LEVEL_MAP = {
+    LogLevel.QUIET: logging.ERROR,
+    LogLevel.NORMAL: logging.INFO,
+    LogLevel.VERBOSE: logging.DEBUG,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
+
 class PyCodeLogger:
     """Centralized logger for PyCode
 
@@ -41,23 +50,19 @@ class PyCodeLogger:
         self._setup_logger(log_file)
 
     def _setup_logger(self, log_file: Optional[Path] = None):
-        """Configure the underlying logger"""
-        # Clear existing handlers
+        """Configure the underlying logger (once; set_level only changes levels)"""
+        # Close and drop handlers left by an earlier logger of the same name
+        for handler in self._logger.handlers:
+            handler.close()
         self._logger.handlers.clear()
 
         # Set level based on verbosity
-        if self.level == LogLevel.QUIET:
-            self._logger.setLevel(logging.ERROR)
-        elif self.level == LogLevel.NORMAL:
-            self._logger.setLevel(logging.INFO)
-        elif self.level == LogLevel.VERBOSE:
-            self._logger.setLevel(logging.DEBUG)
-        else:  # DEBUG
-            self._logger.setLevel(logging.DEBUG)
+        self._logger.setLevel(_LEVEL_MAP[self.level])
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stderr)
         console_handler.setLevel(self._logger.level)
+        self._console_handler = console_handler
 
         # Format: [LEVEL] message key=value key=value
         formatter = logging.Formatter(
@@ -68,6 +73,7 @@ class PyCodeLogger:
         self._logger.addHandler(console_handler)
 
         # File handler (if specified)
+        self._file_handler: Optional[logging.FileHandler] = None
         if log_file:
             log_file.parent.mkdir(parents=True, exist_ok=True)
             file_handler = logging.FileHandler(log_file)
@@ -80,59 +86,55 @@ class PyCodeLogger:
             )
             file_handler.setFormatter(file_formatter)
             self._logger.addHandler(file_handler)
+            self._file_handler = file_handler
 
     def _format_context(self, **context) -> str:
-        """Format context as key=value pairs"""
+        """Format context as key=value pairs (strings with spaces are quoted)"""
         if not context:
             return ""
 
-        parts = []
-        for key, value in context.items():
-            # Handle different types
-            if isinstance(value, str):
-                # Quote strings with spaces
-                if ' ' in value:
-                    parts.append(f'{key}="{value}"')
-                else:
-                    parts.append(f'{key}={value}')
-            else:
-                parts.append(f'{key}={value}')
+        return " " + " ".join(
+            f'{key}="{value}"' if isinstance(value, str) and " " in value else f"{key}={value}"
+            for key, value in context.items()
+        )
+
+    def is_debug_enabled(self) -> bool:
+        """Whether debug() calls produce output at the current level"""
+        return self._logger.isEnabledFor(logging.DEBUG)
 
-        return " " + " ".join(parts) if parts else ""
+    # Each method checks the level first, so a discarded call never
+    # formats its context
 
     def debug(self, message: str, **context):
         """Log debug message (only in verbose/debug mode)"""
-        if self.level in [LogLevel.VERBOSE, LogLevel.DEBUG]:
-            ctx = self._format_context(**context)
-            self._logger.debug(f"{message}{ctx}")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"{message}{self._format_context(**context)}")
 
     def info(self, message: str, **context):
         """Log info message (normal and above)"""
-        if self.level != LogLevel.QUIET:
-            ctx = self._format_context(**context)
-            self._logger.info(f"{message}{ctx}")
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(f"{message}{self._format_context(**context)}")
 
     def warning(self, message: str, **context):
         """Log warning message (always shown except quiet)"""
-        if self.level != LogLevel.QUIET:
-            ctx = self._format_context(**context)
-            self._logger.warning(f"{message}{ctx}")
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(f"{message}{self._format_context(**context)}")
 
     def error(self, message: str, **context):
         """Log error message (always shown)"""
-        ctx = self._format_context(**context)
-        self._logger.error(f"{message}{ctx}")
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._logger.error(f"{message}{self._format_context(**context)}")
 
     def success(self, message: str, **context):
         """Log success message (info level with ✓ prefix)"""
-        if self.level != LogLevel.QUIET:
-            ctx = self._format_context(**context)
-            self._logger.info(f"✓ {message}{ctx}")
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(f"✓ {message}{self._format_context(**context)}")
 
     def set_level(self, level: LogLevel):
-        """Change logging level"""
+        """Change logging level, keeping the existing handlers"""
         self.level = level
-        self._setup_logger()
+        self._logger.setLevel(_LEVEL_MAP[level])
+        self._console_handler.setLevel(_LEVEL_MAP[level])
 
 
 # Global logger instance
@@ -5,12 +5,13 @@ Friendly shortcuts for provider and model names.
 Makes it easier to specify providers without remembering exact names.
 """
 
-from typing import Dict, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Optional
 from .logging import get_logger
 
 
-# Provider name aliases
-PROVIDER_ALIASES: Dict[str, str] = {
+# Provider name aliases (read-only)
+PROVIDER_ALIASES: Mapping[str, str] = MappingProxyType({
     # Anthropic
     "claude": "anthropic",
     "anthropic": "anthropic",
@@ -36,11 +37,11 @@ PROVIDER_ALIASES: Dict[str, str] = {
     # Cohere
     "cohere": "cohere",
     "command": "cohere",
-}
+})
 
 
-# Model aliases (provider, model_id)
-MODEL_ALIASES: Dict[str, Tuple[str, str]] = {
+# Model aliases (provider, model_id) (read-only)
+MODEL_ALIASES: Mapping[str, Tuple[str, str]] = MappingProxyType({
     # Anthropic
     "claude-3.5-sonnet": ("anthropic", "claude-3-5-sonnet-20241022"),
     "claude-3-sonnet": ("anthropic", "claude-3-sonnet-20240229"),
@@ -73,25 +74,48 @@ MODEL_ALIASES: Dict[str, Tuple[str, str]] = {
 
     # Cohere
     "command-r": ("cohere", "command-r-plus"),
-}
+})
 
 
-# Default models for each provider
-DEFAULT_MODELS: Dict[str, str] = {
+# Substrings used to infer a provider from a bare model name, checked in order
+_INFER_TABLE: Tuple[Tuple[str, str], ...] = (
+    ("claude", "anthropic"),
+    ("sonnet", "anthropic"),
+    ("opus", "anthropic"),
+    ("gpt", "openai"),
+    ("gemini", "gemini"),
+    ("mistral", "mistral"),
+    ("command", "cohere"),
+    ("llama", "ollama"),  # also matches codellama
+)
+
+
+# Default models for each provider (read-only)
+DEFAULT_MODELS: Mapping[str, str] = MappingProxyType({
     "anthropic": "claude-3-5-sonnet-20241022",
     "openai": "gpt-4-turbo-preview",
     "ollama": "llama3.2:latest",
     "gemini": "gemini-1.5-pro",
     "mistral": "mistral-large",
     "cohere": "command-r-plus",
-}
+})
 
 
 class ProviderResolver:
-    """Resolves provider and model aliases to canonical names"""
+    """Resolves provider and model aliases to canonical names
+
+    Results are memoized per resolver, so repeated lookups of the same
+    spec (once per request in a long-running session) are a dict hit.
+    """
+
+    __slots__ = ("logger", "_providers", "_models")
 
     def __init__(self):
         self.logger = get_logger()
+        # lowercased alias -> canonical provider
+        self._providers: Dict[str, str] = {}
+        # (model_spec, default_provider) -> (provider, model_id)
+        self._models: Dict[Tuple[str, Optional[str]], Tuple[str, str]] = {}
 
     def resolve_provider(self, alias: str) -> str:
         """Resolve a provider alias to canonical name
@@ -112,10 +136,16 @@ class ProviderResolver:
             'ollama'
         """
         alias_lower = alias.lower()
-
-        if alias_lower in PROVIDER_ALIASES:
-            canonical = PROVIDER_ALIASES[alias_lower]
-            if alias_lower != canonical:
+        resolved = self._providers.get(alias_lower)
+        if resolved is None:
+            resolved = self._providers[alias_lower] = self._resolve_provider(alias, alias_lower)
+        return resolved
+
+    def _resolve_provider(self, alias: str, alias_lower: str) -> str:
+        """Uncached resolve_provider"""
+        canonical = PROVIDER_ALIASES.get(alias_lower)
+        if canonical is not None:
+            if alias_lower != canonical and self.logger.is_debug_enabled():
                 self.logger.debug(
                     f"Resolved provider alias",
                     alias=alias,
@@ -124,7 +154,8 @@ class ProviderResolver:
             return canonical
 
         # If not found, return as-is (might be a valid provider name)
-        self.logger.debug(f"Using provider name as-is", provider=alias)
+        if self.logger.is_debug_enabled():
+            self.logger.debug(f"Using provider name as-is", provider=alias)
         return alias
 
     def resolve_model(
@@ -155,16 +186,31 @@ class ProviderResolver:
             >>> resolver.resolve_model("gpt-4")
             ('openai', 'gpt-4')
         """
+        key = (model_spec, default_provider)
+        resolved = self._models.get(key)
+        if resolved is None:
+            resolved = self._models[key] = self._resolve_model(model_spec, default_provider)
+        return resolved
+
+    def _resolve_model(
+        self,
+        model_spec: str,
+        default_provider: Optional[str]
+    ) -> Tuple[str, str]:
+        """Uncached resolve_model"""
+        debug_enabled = self.logger.is_debug_enabled()
+
         # Check if it's a known alias
-        if model_spec in MODEL_ALIASES:
-            provider, model_id = MODEL_ALIASES[model_spec]
-            self.logger.debug(
-                "Resolved model alias",
-                alias=model_spec,
-                provider=provider,
-                model=model_id
-            )
-            return (provider, model_id)
+        alias = MODEL_ALIASES.get(model_spec)
+        if alias is not None:
+            if debug_enabled:
+                self.logger.debug(
+                    "Resolved model alias",
+                    alias=model_spec,
+                    provider=alias[0],
+                    model=alias[1]
+                )
+            return alias
 
         # Check if it's provider/model format
         if "/" in model_spec:
@@ -173,42 +219,36 @@ class ProviderResolver:
             model_id = parts[1]
 
             # Try to resolve model alias
-            if model_id in MODEL_ALIASES:
-                _, model_id = MODEL_ALIASES[model_id]
-
-            self.logger.debug(
-                "Parsed provider/model",
-                spec=model_spec,
-                provider=provider,
-                model=model_id
-            )
+            alias = MODEL_ALIASES.get(model_id)
+            if alias is not None:
+                model_id = alias[1]
+
+            if debug_enabled:
+                self.logger.debug(
+                    "Parsed provider/model",
+                    spec=model_spec,
+                    provider=provider,
+                    model=model_id
+                )
             return (provider, model_id)
 
         # Use default provider if specified
         if default_provider:
             provider = self.resolve_provider(default_provider)
-            self.logger.debug(
-                "Using default provider",
-                model=model_spec,
-                provider=provider
-            )
+            if debug_enabled:
+                self.logger.debug(
+                    "Using default provider",
+                    model=model_spec,
+                    provider=provider
+                )
             return (provider, model_spec)
 
         # Try to infer provider from model name
         model_lower = model_spec.lower()
 
-        if "claude" in model_lower or "sonnet" in model_lower or "opus" in model_lower:
-            return ("anthropic", model_spec)
-        elif "gpt" in model_lower:
-            return ("openai", model_spec)
-        elif "gemini" in model_lower:
-            return ("gemini", model_spec)
-        elif "mistral" in model_lower:
-            return ("mistral", model_spec)
-        elif "command" in model_lower:
-            return ("cohere", model_spec)
-        elif "llama" in model_lower or "codellama" in model_lower:
-            return ("ollama", model_spec)
+        for needle, provider in _INFER_TABLE:
+            if needle in model_lower:
+                return (provider, model_spec)
 
         # Default to first provider if can't determine
         self.logger.warning(
@@ -235,8 +275,9 @@ class ProviderResolver:
         """
         canonical_provider = self.resolve_provider(provider)
 
-        if canonical_provider in DEFAULT_MODELS:
-            return DEFAULT_MODELS[canonical_provider]
+        default_model = DEFAULT_MODELS.get(canonical_provider)
+        if default_model is not None:
+            return default_model
 
         # Fallback
         self.logger.warning(
@@ -7,28 +7,26 @@ Supports all built-in providers: Anthropic, Ollama, Gemini, Mistral, Cohere, Ope
 
 import os
 from typing import Literal
-from .providers import (
-    Provider,
-    ProviderConfig,
-    AnthropicProvider,
-    OllamaProvider,
-    GeminiProvider,
-    MistralProvider,
-    CohereProvider,
-)
+from . import providers
+from .providers import Provider, ProviderConfig
 from .config import ProviderSettings, ModelConfig
 from .logging import get_logger
 
-# Try to import OpenAI provider
-try:
-    from .providers.openai_provider import OpenAIProvider
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
-
 
 ProviderType = Literal["anthropic", "ollama", "gemini", "mistral", "cohere", "openai"]
 
+# provider type -> (provider class name, display name, API key env vars, default base URL,
+#                   pip package the provider module imports)
+# Classes are looked up on the providers package, which imports them on first use
+_PROVIDER_SPECS: dict[str, tuple[str, str, tuple[str, ...], str | None, str]] = {
+    "anthropic": ("AnthropicProvider", "Anthropic", ("ANTHROPIC_API_KEY",), None, "anthropic"),
+    "ollama": ("OllamaProvider", "Ollama", (), "http://localhost:11434", "httpx"),
+    "openai": ("OpenAIProvider", "OpenAI", ("OPENAI_API_KEY",), None, "openai"),
+    "gemini": ("GeminiProvider", "Gemini", ("GEMINI_API_KEY", "GOOGLE_API_KEY"), None, "httpx"),
+    "mistral": ("MistralProvider", "Mistral", ("MISTRAL_API_KEY",), None, "httpx"),
+    "cohere": ("CohereProvider", "Cohere", ("COHERE_API_KEY",), None, "httpx"),
+}
+
 
 class ProviderFactory:
     """Factory for creating provider instances from configuration"""
@@ -79,78 +77,37 @@ class ProviderFactory:
         provider_config = ProviderConfig(**config_kwargs)
 
         # Create provider based on type
-        provider_lower = provider_type.lower()
-
-        if provider_lower == "anthropic":
-            # Try to get API key from env if not in config
-            if not provider_config.api_key:
-                provider_config.api_key = os.getenv("ANTHROPIC_API_KEY")
-                if not provider_config.api_key:
-                    logger.warning(
-                        "No Anthropic API key found",
-                        hint="Set ANTHROPIC_API_KEY environment variable"
-                    )
-            return AnthropicProvider(provider_config)
-
-        elif provider_lower == "ollama":
-            # Default Ollama to localhost if no base URL
-            if not provider_config.base_url:
-                provider_config.base_url = "http://localhost:11434"
-            return OllamaProvider(provider_config)
-
-        elif provider_lower == "openai":
-            if not HAS_OPENAI:
-                raise ValueError(
-                    "OpenAI provider not available. Install with: pip install openai"
-                )
-            # Try to get API key from env if not in config
-            if not provider_config.api_key:
-                provider_config.api_key = os.getenv("OPENAI_API_KEY")
-                if not provider_config.api_key:
-                    logger.warning(
-                        "No OpenAI API key found",
-                        hint="Set OPENAI_API_KEY environment variable"
-                    )
-            return OpenAIProvider(provider_config)
-
-        elif provider_lower == "gemini":
-            # Try to get API key from env if not in config
-            if not provider_config.api_key:
-                provider_config.api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-                if not provider_config.api_key:
-                    logger.warning(
-                        "No Gemini API key found",
-                        hint="Set GEMINI_API_KEY or GOOGLE_API_KEY environment variable"
-                    )
-            return GeminiProvider(provider_config)
-
-        elif provider_lower == "mistral":
-            # Try to get API key from env if not in config
-            if not provider_config.api_key:
-                provider_config.api_key = os.getenv("MISTRAL_API_KEY")
-                if not provider_config.api_key:
-                    logger.warning(
-                        "No Mistral API key found",
-                        hint="Set MISTRAL_API_KEY environment variable"
-                    )
-            return MistralProvider(provider_config)
-
-        elif provider_lower == "cohere":
-            # Try to get API key from env if not in config
-            if not provider_config.api_key:
-                provider_config.api_key = os.getenv("COHERE_API_KEY")
-                if not provider_config.api_key:
-                    logger.warning(
-                        "No Cohere API key found",
-                        hint="Set COHERE_API_KEY environment variable"
-                    )
-            return CohereProvider(provider_config)
-
-        else:
+        spec = _PROVIDER_SPECS.get(provider_type.lower())
+        if spec is None:
             raise ValueError(
                 f"Unsupported provider: {provider_type}. "
-                f"Supported providers: anthropic, ollama, openai, gemini, mistral, cohere"
+                f"Supported providers: {', '.join(_PROVIDER_SPECS)}"
             )
+        class_name, display_name, env_vars, default_base_url, package = spec
+
+        try:
+            provider_class = getattr(providers, class_name)
+        except ImportError:
+            raise ValueError(
+                f"{display_name} provider not available. Install with: pip install {package}"
+            )
+
+        # Default the base URL (e.g. Ollama on localhost)
+        if default_base_url and not provider_config.base_url:
+            provider_config.base_url = default_base_url
+
+        # Try to get API key from env if not in config
+        if env_vars and not provider_config.api_key:
+            provider_config.api_key = next(
+                (value for name in env_vars if (value := os.getenv(name))), None
+            )
+            if not provider_config.api_key:
+                logger.warning(
+                    f"No {display_name} API key found",
+                    hint=f"Set {' or '.join(env_vars)} environment variable"
+                )
+
+        return provider_class(provider_config)
 
     @staticmethod
     def create_from_model_config(model_config: ModelConfig) -> Provider:
@@ -1,32 +1,59 @@
-"""Provider integrations for LLM APIs"""
+"""Provider integrations for LLM APIs
+
+Concrete providers are imported on first access (PEP 562), so only the SDKs
+of providers that are actually used get loaded.
+"""
+
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any
 
 from .base import Provider, ProviderConfig
-from .anthropic_provider import AnthropicProvider
-from .ollama_provider import OllamaProvider
-from .gemini_provider import GeminiProvider
-from .mistral_provider import MistralProvider
-from .cohere_provider import CohereProvider
-
-# Optional import for OpenAI
-try:
+
+if TYPE_CHECKING:
+    from .anthropic_provider import AnthropicProvider
+    from .ollama_provider import OllamaProvider
+    from .gemini_provider import GeminiProvider
+    from .mistral_provider import MistralProvider
+    from .cohere_provider import CohereProvider
     from .openai_provider import OpenAIProvider
-    __all__ = [
-        "Provider",
-        "ProviderConfig",
-        "AnthropicProvider",
-        "OllamaProvider",
-        "GeminiProvider",
-        "MistralProvider",
-        "CohereProvider",
-        "OpenAIProvider",
-    ]
-except ImportError:
-    __all__ = [
-        "Provider",
-        "ProviderConfig",
-        "AnthropicProvider",
-        "OllamaProvider",
-        "GeminiProvider",
-        "MistralProvider",
-        "CohereProvider",
-    ]
+
+# Provider class name -> module defining it
+_LAZY = {
+    "AnthropicProvider": ".anthropic_provider",
+    "OllamaProvider": ".ollama_provider",
+    "GeminiProvider": ".gemini_provider",
+    "MistralProvider": ".mistral_provider",
+    "CohereProvider": ".cohere_provider",
+    "OpenAIProvider": ".openai_provider",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so __getattr__ isn't hit again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = [
+    "Provider",
+    "ProviderConfig",
+    "AnthropicProvider",
+    "OllamaProvider",
+    "GeminiProvider",
+    "MistralProvider",
+    "CohereProvider",
+]
+
+# Optional: OpenAI (checked without importing the SDK)
+if importlib.util.find_spec("openai") is not None:
+    __all__.append("OpenAIProvider")
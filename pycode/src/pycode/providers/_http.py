@@ -0,0 +1,82 @@
+"""Shared HTTP client for the httpx-based providers
+
+Cohere, Gemini, Mistral and Ollama all send their requests through one
+pooled httpx.AsyncClient, so connections (and TLS sessions) are reused
+across calls and across provider instances. Per-provider settings such as
+auth headers and timeouts are passed with each request.
+
+With h2 installed (the speedups extra), the client negotiates HTTP/2, so
+concurrent streams to the same API share one multiplexed connection.
+"""
+
+import asyncio
+import importlib.util
+from typing import AsyncIterator
+
+import httpx
+
+# HTTP/2 needs the optional h2 package
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Connection pool shared by all providers
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30,
+)
+
+# Headers for a request body sent as content=json_dumps(...)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_client: httpx.AsyncClient | None = None
+# Event loop the client was created on; a client can't be reused across loops
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client, creating it on first use in the running loop"""
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    # No await between the check and the assignment, so concurrent callers
+    # on the same loop can't create two clients
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2, limits=_LIMITS, timeout=httpx.Timeout(60)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (call once at shutdown)"""
+    global _client, _client_loop
+
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def aiter_raw_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield the lines of a streamed response body as bytes
+
+    Unlike response.aiter_lines(), nothing is decoded to str; the JSON
+    parsers accept bytes directly. LF and CRLF line endings are stripped.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        # Slicing the view copies each line once; slicing the bytearray
+        # would copy it into a new bytearray first
+        with memoryview(buffer) as view:
+            while (end := buffer.find(b"\n", start)) != -1:
+                yield bytes(view[start:end]).rstrip(b"\r")
+                start = end + 1
+        # Drop the consumed lines once per chunk, not once per line (the
+        # view must be released before the buffer can be resized)
+        del buffer[:start]
+
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
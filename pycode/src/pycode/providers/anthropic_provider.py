@@ -7,12 +7,29 @@ from ..retry import retry_api_call
 from ..logging import get_logger
 
 
+_MODELS: tuple[str, ...] = (
+    "claude-3-7-sonnet-20250219",
+    "claude-3-5-sonnet-20241022",
+    "claude-3-5-haiku-20241022",
+    "claude-3-opus-20240229",
+)
+
+# Stream events the loop acts on. The SDK's message stream also yields
+# content_block_start/stop, ping, and a "text"/"input_json" helper event
+# for every delta, so most events are skipped with a single set lookup.
+_HANDLED_EVENTS = frozenset(
+    {"content_block_delta", "message_start", "message_delta", "message_stop"}
+)
+
+
 class AnthropicProvider(Provider):
     """Anthropic Claude provider implementation"""
 
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.client = anthropic.AsyncAnthropic(api_key=config.api_key)
+        # Retries are left to @retry_api_call; the SDK retrying too would
+        # multiply the attempts
+        self.client = anthropic.AsyncAnthropic(api_key=config.api_key, max_retries=0)
         self.logger = get_logger()
 
     @property
@@ -40,20 +57,16 @@ class AnthropicProvider(Provider):
         )
 
         # Convert messages to Anthropic format
-        anthropic_messages = []
-        for msg in messages:
-            role = msg.get("role")
-            content = msg.get("content", "")
-
-            # Simple conversion (can be enhanced for multi-part content)
-            anthropic_messages.append({"role": role, "content": content})
+        # (simple conversion, can be enhanced for multi-part content)
+        anthropic_messages = [
+            {"role": msg.get("role"), "content": msg.get("content", "")} for msg in messages
+        ]
 
         # Prepare request
         request_params: dict[str, Any] = {
             "model": model,
             "messages": anthropic_messages,
             "max_tokens": max_tokens or 8192,
-            "stream": True,
         }
 
         if system:
@@ -65,43 +78,49 @@ class AnthropicProvider(Provider):
         if tools:
             request_params["tools"] = tools
 
+        # Token usage, taken from the stream events as they arrive
+        input_tokens = 0
+        output_tokens = 0
+
         # Stream response
         async with self.client.messages.stream(**request_params) as stream:
             yield StreamEvent(type="start", data={})
 
             async for event in stream:
-                if event.type == "content_block_start":
+                event_type = event.type
+                if event_type not in _HANDLED_EVENTS:
                     continue
 
-                elif event.type == "content_block_delta":
-                    if hasattr(event.delta, "text"):
-                        yield StreamEvent(
-                            type="text_delta",
-                            data={"text": event.delta.text},
-                        )
+                # Checked first: there is one content delta per token
+                if event_type == "content_block_delta":
+                    # Text deltas carry .text; tool input (input_json_delta) doesn't
+                    text = getattr(event.delta, "text", None)
+                    if text is not None:
+                        yield StreamEvent(type="text_delta", data={"text": text})
+
+                elif event_type == "message_start":
+                    input_tokens = event.message.usage.input_tokens
 
-                    elif hasattr(event.delta, "type") and event.delta.type == "input_json_delta":
-                        # Tool input streaming
-                        continue
+                elif event_type == "message_delta":
+                    # Cumulative count for the message so far
+                    output_tokens = event.usage.output_tokens
 
-                elif event.type == "message_stop":
+                elif event_type == "message_stop":
                     yield StreamEvent(type="finish", data={"finish_reason": "stop"})
 
-        final_message = await stream.get_final_message()
         yield StreamEvent(
             type="usage",
             data={
-                "prompt_tokens": final_message.usage.input_tokens,
-                "completion_tokens": final_message.usage.output_tokens,
-                "total_tokens": final_message.usage.input_tokens + final_message.usage.output_tokens,
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
             },
         )
 
+    async def close(self):
+        """Close the underlying HTTP client"""
+        await self.client.close()
+
     async def list_models(self) -> list[str]:
         """List available Claude models"""
-        return [
-            "claude-3-7-sonnet-20250219",
-            "claude-3-5-sonnet-20241022",
-            "claude-3-5-haiku-20241022",
-            "claude-3-opus-20240229",
-        ]
+        return list(_MODELS)
@@ -1,9 +1,11 @@
 """Base provider classes"""
 
 from __future__ import annotations
-from typing import Any, AsyncIterator
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Callable
 from abc import ABC, abstractmethod
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from dataclasses import dataclass
 
 
@@ -16,10 +18,10 @@ class ProviderConfig(BaseModel):
     api_key: str | None = None
     base_url: str | None = None
     organization: str | None = None
-    extra: dict[str, Any] = {}
+    extra: dict[str, Any] = Field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamEvent:
     """Event emitted during streaming"""
 
@@ -27,11 +29,101 @@ class StreamEvent:
     data: dict[str, Any]
 
 
+# Marks the end of a buffered stream
+_END = object()
+
+
+async def buffered_stream(
+    events: AsyncIterator[StreamEvent], maxsize: int = 64, coalesce_text: bool = True
+) -> AsyncIterator[StreamEvent]:
+    """
+    Read a provider stream ahead of its consumer
+
+    A background task pulls events into a bounded queue, so the response
+    keeps being read while the consumer is busy (rendering, saving), up to
+    maxsize events ahead. Errors from the stream are raised to the consumer
+    after the events before them; stopping early cancels the reader and
+    closes the stream.
+
+    With coalesce_text, text deltas that are already queued when the
+    consumer asks for the next event are merged into one, so a busy
+    consumer handles one event per batch of tokens instead of one per
+    token. Nothing waits for more text, so no latency is added.
+    """
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize)
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception:
+            # Wake the consumer; it collects the error from the task
+            await queue.put(_END)
+            raise
+        await queue.put(_END)
+
+    task = asyncio.create_task(pump())
+    try:
+        # Event taken from the queue while merging text, not yet yielded
+        pending = None
+        while True:
+            if pending is None:
+                event = await queue.get()
+            else:
+                event, pending = pending, None
+            if event is _END:
+                break
+
+            if coalesce_text and event.type == "text_delta" and not queue.empty():
+                texts = [event.data.get("text", "")]
+                while not queue.empty():
+                    queued = queue.get_nowait()
+                    if queued is _END or queued.type != "text_delta":
+                        pending = queued
+                        break
+                    texts.append(queued.data.get("text", ""))
+                if len(texts) > 1:
+                    event = StreamEvent(type="text_delta", data={"text": "".join(texts)})
+
+            yield event
+
+        # Re-raise the stream's error, if it ended with one
+        await task
+    finally:
+        # On an early stop, wait for the reader to actually stop, then close
+        # the stream so its HTTP response is released now rather than by GC.
+        # An error it ended with is of no interest to a consumer that left.
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
 class Provider(ABC):
     """Base class for LLM providers"""
 
     def __init__(self, config: ProviderConfig):
         self.config = config
+        # (tools list, converted tools) for the last tools list seen
+        self._converted_tools: tuple[list[dict[str, Any]], list[dict[str, Any]]] | None = None
+
+    def _cached_tools(
+        self,
+        tools: list[dict[str, Any]],
+        convert: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """
+        convert(tools), reused for as long as the same tools list comes in
+
+        The runner passes the same list on every iteration, so providers
+        that translate tool definitions only do it once per list.
+        """
+        cached = self._converted_tools
+        if cached is None or cached[0] is not tools:
+            cached = self._converted_tools = (tools, convert(tools))
+        return cached[1]
 
     @property
     @abstractmethod
@@ -57,3 +149,12 @@ class Provider(ABC):
     async def list_models(self) -> list[str]:
         """List available models"""
         pass
+
+    async def close(self) -> None:
+        """Release the provider's resources (nothing by default)"""
+
+    async def __aenter__(self) -> Provider:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
@@ -9,11 +9,24 @@ import json
 from typing import Any, AsyncIterator
 import httpx
 
+from .._json import json_dumps, json_loads
+from ._http import JSON_HEADERS, aiter_raw_lines, get_http_client
 from .base import Provider, ProviderConfig, StreamEvent
 from ..retry import retry_api_call
 from ..logging import get_logger
 
 
+_MODELS: tuple[str, ...] = (
+    "command",
+    "command-light",
+    "command-r",
+    "command-r-plus",
+)
+
+
+_DEFAULT_BASE_URL = "https://api.cohere.ai/v1"
+
+
 class CohereProvider(Provider):
     """Provider for Cohere models
 
@@ -33,19 +46,33 @@ class CohereProvider(Provider):
 
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.api_key
-        self.base_url = config.base_url or "https://api.cohere.ai/v1"
         self.timeout = config.extra.get("timeout", 60)
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
         self.logger = get_logger()
 
+    @property
+    def base_url(self) -> str:
+        return self.config.base_url or _DEFAULT_BASE_URL
+
     @property
     def name(self) -> str:
         return "cohere"
 
+    @staticmethod
+    def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Tool definitions in Cohere format"""
+        cohere_tools = []
+        for tool in tools:
+            if "function" in tool:
+                func = tool["function"]
+                # Convert to Cohere tool format
+                cohere_tools.append({
+                    "name": func.get("name"),
+                    "description": func.get("description"),
+                    "parameter_definitions": func.get("parameters", {}).get("properties", {})
+                })
+
+        return cohere_tools
+
     @retry_api_call
     async def stream(
         self,
@@ -117,33 +144,26 @@ class CohereProvider(Provider):
 
         # Add tools if provided
         if tools:
-            cohere_tools = []
-            for tool in tools:
-                if "function" in tool:
-                    func = tool["function"]
-                    # Convert to Cohere tool format
-                    cohere_tools.append({
-                        "name": func.get("name"),
-                        "description": func.get("description"),
-                        "parameter_definitions": func.get("parameters", {}).get("properties", {})
-                    })
-
+            cohere_tools = self._cached_tools(tools, self._convert_tools)
             if cohere_tools:
                 request_data["tools"] = cohere_tools
 
         # Stream from Cohere
         url = f"{self.base_url}/chat"
+        headers = {**JSON_HEADERS, "Authorization": f"Bearer {self.config.api_key}"}
 
         try:
-            async with self.client.stream("POST", url, json=request_data) as response:
+            async with get_http_client().stream(
+                "POST", url, content=json_dumps(request_data), headers=headers, timeout=self.timeout
+            ) as response:
                 response.raise_for_status()
 
-                async for line in response.aiter_lines():
+                async for line in aiter_raw_lines(response):
                     if not line:
                         continue
 
                     try:
-                        event = json.loads(line)
+                        event = json_loads(line)
 
                         event_type = event.get("event_type")
 
@@ -181,7 +201,7 @@ class CohereProvider(Provider):
             try:
                 error_detail = e.response.json()
                 error_msg += f" - {error_detail.get('message', '')}"
-            except:
+            except Exception:
                 pass
             raise Exception(error_msg)
 
@@ -204,7 +224,7 @@ class CohereProvider(Provider):
             Response dict with content and tool_calls
         """
 
-        response_text = ""
+        text_chunks = []
         tool_calls = []
 
         async for event in self.stream(
@@ -216,39 +236,15 @@ class CohereProvider(Provider):
             max_tokens=max_tokens,
         ):
             if event.type == "text_delta":
-                response_text += event.data.get("text", "")
+                text_chunks.append(event.data.get("text", ""))
             elif event.type == "tool_use":
                 tool_calls.append(event.data)
 
         return {
-            "content": response_text,
+            "content": "".join(text_chunks),
             "tool_calls": tool_calls if tool_calls else None,
         }
 
     async def list_models(self) -> list[str]:
         """List available Cohere models"""
-        return [
-            "command",
-            "command-light",
-            "command-r",
-            "command-r-plus",
-        ]
-
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-
-    def __del__(self):
-        """Cleanup"""
-        try:
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.client.aclose())
-                else:
-                    loop.run_until_complete(self.client.aclose())
-            except:
-                pass
-        except:
-            pass
+        return list(_MODELS)
@@ -9,11 +9,23 @@ import json
 from typing import Any, AsyncIterator
 import httpx
 
+from .._json import json_dumps, json_loads
+from ._http import JSON_HEADERS, aiter_raw_lines, get_http_client
 from .base import Provider, ProviderConfig, StreamEvent
 from ..retry import retry_api_call
 from ..logging import get_logger
 
 
+_MODELS: tuple[str, ...] = (
+    "gemini-1.5-pro",
+    "gemini-1.5-flash",
+    "gemini-1.0-pro",
+)
+
+
+_DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
 class GeminiProvider(Provider):
     """Provider for Google Gemini models
 
@@ -32,16 +44,34 @@ class GeminiProvider(Provider):
 
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.api_key
-        self.base_url = config.base_url or "https://generativelanguage.googleapis.com/v1beta"
         self.timeout = config.extra.get("timeout", 60)
-        self.client = httpx.AsyncClient(timeout=self.timeout)
         self.logger = get_logger()
 
+    @property
+    def base_url(self) -> str:
+        return self.config.base_url or _DEFAULT_BASE_URL
+
     @property
     def name(self) -> str:
         return "gemini"
 
+    @staticmethod
+    def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Tool definitions in Gemini format"""
+        gemini_tools = []
+        for tool in tools:
+            if "function" in tool:
+                func = tool["function"]
+                gemini_tools.append({
+                    "functionDeclarations": [{
+                        "name": func.get("name"),
+                        "description": func.get("description"),
+                        "parameters": func.get("parameters", {})
+                    }]
+                })
+
+        return gemini_tools
+
     @retry_api_call
     async def stream(
         self,
@@ -108,43 +138,34 @@ class GeminiProvider(Provider):
 
         # Add tools if provided
         if tools:
-            gemini_tools = []
-            for tool in tools:
-                if "function" in tool:
-                    func = tool["function"]
-                    gemini_tools.append({
-                        "functionDeclarations": [{
-                            "name": func.get("name"),
-                            "description": func.get("description"),
-                            "parameters": func.get("parameters", {})
-                        }]
-                    })
-
+            gemini_tools = self._cached_tools(tools, self._convert_tools)
             if gemini_tools:
                 request_data["tools"] = gemini_tools
 
         # Stream from Gemini
         url = f"{self.base_url}/models/{model}:streamGenerateContent"
-        params = {"key": self.api_key, "alt": "sse"}
+        params = {"key": self.config.api_key, "alt": "sse"}
 
         try:
-            async with self.client.stream(
+            async with get_http_client().stream(
                 "POST",
                 url,
                 params=params,
-                json=request_data,
+                content=json_dumps(request_data),
+                headers=JSON_HEADERS,
+                timeout=self.timeout,
             ) as response:
                 response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    if not line or not line.startswith("data: "):
+                async for line in aiter_raw_lines(response):
+                    if not line.startswith(b"data:"):
                         continue
 
-                    # Remove "data: " prefix
-                    json_str = line[6:]
+                    # Remove "data:" and the single optional space after it
+                    json_str = line[6:] if line[5:6] == b" " else line[5:]
 
                     try:
-                        chunk = json.loads(json_str)
+                        chunk = json_loads(json_str)
 
                         # Extract candidates
                         candidates = chunk.get("candidates", [])
@@ -183,7 +204,7 @@ class GeminiProvider(Provider):
             try:
                 error_detail = e.response.json()
                 error_msg += f" - {error_detail.get('error', {}).get('message', '')}"
-            except:
+            except Exception:
                 pass
             raise Exception(error_msg)
 
@@ -206,7 +227,7 @@ class GeminiProvider(Provider):
             Response dict with content and tool_calls
         """
 
-        response_text = ""
+        text_chunks = []
         tool_calls = []
 
         async for event in self.stream(
@@ -218,38 +239,15 @@ class GeminiProvider(Provider):
             max_tokens=max_tokens,
         ):
             if event.type == "text_delta":
-                response_text += event.data.get("text", "")
+                text_chunks.append(event.data.get("text", ""))
             elif event.type == "tool_use":
                 tool_calls.append(event.data)
 
         return {
-            "content": response_text,
+            "content": "".join(text_chunks),
             "tool_calls": tool_calls if tool_calls else None,
         }
 
     async def list_models(self) -> list[str]:
         """List available Gemini models"""
-        return [
-            "gemini-1.5-pro",
-            "gemini-1.5-flash",
-            "gemini-1.0-pro",
-        ]
-
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-
-    def __del__(self):
-        """Cleanup"""
-        try:
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.client.aclose())
-                else:
-                    loop.run_until_complete(self.client.aclose())
-            except:
-                pass
-        except:
-            pass
+        return list(_MODELS)
@@ -9,11 +9,24 @@ import json
 from typing import Any, AsyncIterator
 import httpx
 
+from .._json import json_dumps, json_loads
+from ._http import JSON_HEADERS, aiter_raw_lines, get_http_client
 from .base import Provider, ProviderConfig, StreamEvent
 from ..retry import retry_api_call
 from ..logging import get_logger
 
 
+_MODELS: tuple[str, ...] = (
+    "mistral-tiny",
+    "mistral-small",
+    "mistral-medium",
+    "mistral-large",
+)
+
+
+_DEFAULT_BASE_URL = "https://api.mistral.ai/v1"
+
+
 class MistralProvider(Provider):
     """Provider for Mistral AI models
 
@@ -33,19 +46,30 @@ class MistralProvider(Provider):
 
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.api_key
-        self.base_url = config.base_url or "https://api.mistral.ai/v1"
         self.timeout = config.extra.get("timeout", 60)
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
         self.logger = get_logger()
 
+    @property
+    def base_url(self) -> str:
+        return self.config.base_url or _DEFAULT_BASE_URL
+
     @property
     def name(self) -> str:
         return "mistral"
 
+    @staticmethod
+    def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Tool definitions in Mistral format"""
+        mistral_tools = []
+        for tool in tools:
+            if "function" in tool:
+                mistral_tools.append({
+                    "type": "function",
+                    "function": tool["function"]
+                })
+
+        return mistral_tools
+
     @retry_api_call
     async def stream(
         self,
@@ -79,22 +103,13 @@ class MistralProvider(Provider):
             tools=len(tools) if tools else 0
         )
 
-        # Build messages for Mistral
-        mistral_messages = []
-
-        # Add system message if provided
-        if system:
-            mistral_messages.append({
-                "role": "system",
-                "content": system
-            })
-
-        # Add conversation messages
-        for msg in messages:
-            mistral_messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", "")
-            })
+        # Build messages for Mistral: system message (if provided), then
+        # the conversation messages
+        mistral_messages = [{"role": "system", "content": system}] if system else []
+        mistral_messages += [
+            {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+            for msg in messages
+        ]
 
         # Build request
         request_data = {
@@ -107,37 +122,33 @@ class MistralProvider(Provider):
 
         # Add tools if provided
         if tools:
-            mistral_tools = []
-            for tool in tools:
-                if "function" in tool:
-                    mistral_tools.append({
-                        "type": "function",
-                        "function": tool["function"]
-                    })
-
+            mistral_tools = self._cached_tools(tools, self._convert_tools)
             if mistral_tools:
                 request_data["tools"] = mistral_tools
                 request_data["tool_choice"] = "auto"
 
         # Stream from Mistral
         url = f"{self.base_url}/chat/completions"
+        headers = {**JSON_HEADERS, "Authorization": f"Bearer {self.config.api_key}"}
 
         try:
-            async with self.client.stream("POST", url, json=request_data) as response:
+            async with get_http_client().stream(
+                "POST", url, content=json_dumps(request_data), headers=headers, timeout=self.timeout
+            ) as response:
                 response.raise_for_status()
 
-                async for line in response.aiter_lines():
-                    if not line or not line.startswith("data: "):
+                async for line in aiter_raw_lines(response):
+                    if not line.startswith(b"data:"):
                         continue
 
-                    # Remove "data: " prefix
-                    json_str = line[6:]
+                    # Remove "data:" and the single optional space after it
+                    json_str = line[6:] if line[5:6] == b" " else line[5:]
 
-                    if json_str == "[DONE]":
+                    if json_str == b"[DONE]":
                         break
 
                     try:
-                        chunk = json.loads(json_str)
+                        chunk = json_loads(json_str)
 
                         # Extract delta
                         choices = chunk.get("choices", [])
@@ -162,8 +173,8 @@ class MistralProvider(Provider):
                                     args = {}
                                     if function.get("arguments"):
                                         try:
-                                            args = json.loads(function["arguments"])
-                                        except:
+                                            args = json_loads(function["arguments"])
+                                        except (json.JSONDecodeError, TypeError):
                                             args = {}
 
                                     yield StreamEvent(
@@ -183,7 +194,7 @@ class MistralProvider(Provider):
             try:
                 error_detail = e.response.json()
                 error_msg += f" - {error_detail.get('message', '')}"
-            except:
+            except Exception:
                 pass
             raise Exception(error_msg)
 
@@ -206,7 +217,7 @@ class MistralProvider(Provider):
             Response dict with content and tool_calls
         """
 
-        response_text = ""
+        text_chunks = []
         tool_calls = []
 
         async for event in self.stream(
@@ -218,39 +229,15 @@ class MistralProvider(Provider):
             max_tokens=max_tokens,
         ):
             if event.type == "text_delta":
-                response_text += event.data.get("text", "")
+                text_chunks.append(event.data.get("text", ""))
             elif event.type == "tool_use":
                 tool_calls.append(event.data)
 
         return {
-            "content": response_text,
+            "content": "".join(text_chunks),
             "tool_calls": tool_calls if tool_calls else None,
         }
 
     async def list_models(self) -> list[str]:
         """List available Mistral models"""
-        return [
-            "mistral-tiny",
-            "mistral-small",
-            "mistral-medium",
-            "mistral-large",
-        ]
-
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-
-    def __del__(self):
-        """Cleanup"""
-        try:
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.client.aclose())
-                else:
-                    loop.run_until_complete(self.client.aclose())
-            except:
-                pass
-        except:
-            pass
+        return list(_MODELS)
@@ -9,11 +9,16 @@ import json
 from typing import Any, AsyncIterator
 import httpx
 
+from .._json import json_dumps, json_loads
+from ._http import JSON_HEADERS, aiter_raw_lines, get_http_client
 from .base import Provider, ProviderConfig, StreamEvent
 from ..retry import retry_network
 from ..logging import get_logger
 
 
+_DEFAULT_BASE_URL = "http://localhost:11434"
+
+
 class OllamaProvider(Provider):
     """Provider for Ollama local models
 
@@ -29,15 +34,35 @@ class OllamaProvider(Provider):
 
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "http://localhost:11434"
         self.timeout = config.extra.get("timeout", 120)
-        self.client = httpx.AsyncClient(timeout=self.timeout)
         self.logger = get_logger()
 
+    @property
+    def base_url(self) -> str:
+        return self.config.base_url or _DEFAULT_BASE_URL
+
     @property
     def name(self) -> str:
         return "ollama"
 
+    @staticmethod
+    def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Tool definitions in Ollama format"""
+        ollama_tools = []
+        for tool in tools:
+            if "function" in tool:
+                func = tool["function"]
+                ollama_tools.append({
+                    "type": "function",
+                    "function": {
+                        "name": func.get("name"),
+                        "description": func.get("description"),
+                        "parameters": func.get("parameters", {})
+                    }
+                })
+
+        return ollama_tools
+
     @retry_network
     async def stream(
         self,
@@ -101,20 +126,7 @@ class OllamaProvider(Provider):
 
         # Add tools if provided (Ollama function calling)
         if tools:
-            # Convert tools to Ollama format
-            ollama_tools = []
-            for tool in tools:
-                if "function" in tool:
-                    func = tool["function"]
-                    ollama_tools.append({
-                        "type": "function",
-                        "function": {
-                            "name": func.get("name"),
-                            "description": func.get("description"),
-                            "parameters": func.get("parameters", {})
-                        }
-                    })
-
+            ollama_tools = self._cached_tools(tools, self._convert_tools)
             if ollama_tools:
                 payload["tools"] = ollama_tools
 
@@ -122,18 +134,19 @@ class OllamaProvider(Provider):
         url = f"{self.base_url}/api/chat"
 
         try:
-            async with self.client.stream("POST", url, json=payload) as response:
+            async with get_http_client().stream(
+                "POST", url, content=json_dumps(payload), headers=JSON_HEADERS, timeout=self.timeout
+            ) as response:
                 response.raise_for_status()
 
-                accumulated_text = ""
                 tool_calls = []
 
-                async for line in response.aiter_lines():
+                async for line in aiter_raw_lines(response):
                     if not line:
                         continue
 
                     try:
-                        chunk = json.loads(line)
+                        chunk = json_loads(line)
 
                         # Handle message chunk
                         if "message" in chunk:
@@ -142,7 +155,6 @@ class OllamaProvider(Provider):
                             # Text content
                             if "content" in message and message["content"]:
                                 text = message["content"]
-                                accumulated_text += text
                                 yield StreamEvent(
                                     type="text_delta",
                                     data={"text": text}
@@ -176,7 +188,7 @@ class OllamaProvider(Provider):
             try:
                 error_detail = e.response.json()
                 error_msg += f" - {error_detail.get('error', '')}"
-            except:
+            except Exception:
                 pass
             raise Exception(error_msg)
 
@@ -215,7 +227,7 @@ class OllamaProvider(Provider):
         """
 
         # Collect all streaming events
-        response_text = ""
+        text_chunks = []
         tool_calls = []
 
         async for event in self.stream(
@@ -227,12 +239,12 @@ class OllamaProvider(Provider):
             max_tokens=max_tokens,
         ):
             if event.type == "text_delta":
-                response_text += event.data.get("text", "")
+                text_chunks.append(event.data.get("text", ""))
             elif event.type == "tool_use":
                 tool_calls.append(event.data)
 
         return {
-            "content": response_text,
+            "content": "".join(text_chunks),
             "tool_calls": tool_calls if tool_calls else None,
         }
 
@@ -246,7 +258,7 @@ class OllamaProvider(Provider):
         url = f"{self.base_url}/api/tags"
 
         try:
-            response = await self.client.get(url)
+            response = await get_http_client().get(url, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
 
@@ -260,23 +272,3 @@ class OllamaProvider(Provider):
             raise Exception("Cannot connect to Ollama. Make sure it's running.")
         except Exception as e:
             raise Exception(f"Failed to list models: {str(e)}")
-
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-
-    def __del__(self):
-        """Cleanup on deletion"""
-        try:
-            # Try to close client if event loop is available
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self.client.aclose())
-                else:
-                    loop.run_until_complete(self.client.aclose())
-            except:
-                pass
-        except:
-            pass
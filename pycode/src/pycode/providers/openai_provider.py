@@ -5,6 +5,15 @@ import openai
 from .base import Provider, ProviderConfig, StreamEvent
 
 
+_MODELS: tuple[str, ...] = (
+    "gpt-4o",
+    "gpt-4o-mini",
+    "gpt-4-turbo",
+    "gpt-4",
+    "gpt-3.5-turbo",
+)
+
+
 class OpenAIProvider(Provider):
     """OpenAI GPT provider implementation"""
 
@@ -57,37 +66,42 @@ class OpenAIProvider(Provider):
         yield StreamEvent(type="start", data={})
 
         async for chunk in stream:
-            if not chunk.choices:
+            choices = chunk.choices
+            if not choices:
                 continue
 
-            delta = chunk.choices[0].delta
+            # Each attribute is read once per chunk
+            choice = choices[0]
+            delta = choice.delta
 
-            if delta.content:
-                yield StreamEvent(type="text_delta", data={"text": delta.content})
+            content = delta.content
+            if content:
+                yield StreamEvent(type="text_delta", data={"text": content})
 
-            if delta.tool_calls:
-                for tool_call in delta.tool_calls:
+            tool_calls = delta.tool_calls
+            if tool_calls:
+                for tool_call in tool_calls:
+                    function = tool_call.function
                     yield StreamEvent(
                         type="tool_call",
                         data={
                             "tool_call_id": tool_call.id,
-                            "tool_name": tool_call.function.name,
-                            "arguments": tool_call.function.arguments,
+                            "tool_name": function.name,
+                            "arguments": function.arguments,
                         },
                     )
 
-            if chunk.choices[0].finish_reason:
+            finish_reason = choice.finish_reason
+            if finish_reason:
                 yield StreamEvent(
                     type="finish",
-                    data={"finish_reason": chunk.choices[0].finish_reason},
+                    data={"finish_reason": finish_reason},
                 )
 
+    async def close(self):
+        """Close the underlying HTTP client"""
+        await self.client.close()
+
     async def list_models(self) -> list[str]:
         """List available OpenAI models"""
-        return [
-            "gpt-4o",
-            "gpt-4o-mini",
-            "gpt-4-turbo",
-            "gpt-4",
-            "gpt-3.5-turbo",
-        ]
+        return list(_MODELS)
@@ -6,6 +6,8 @@ Handles transient failures for API calls and network operations.
 
 import asyncio
 import functools
+import inspect
+import random
 from typing import Callable, Type, TypeVar, Union, Tuple
 from .logging import get_logger
 
@@ -19,13 +21,33 @@ class RetryError(Exception):
         self.last_exception = last_exception
 
 
+def _retry_after(exc: BaseException | None) -> float | None:
+    """Seconds the server asked to wait (Retry-After) for a failed HTTP call
+
+    Providers re-raise HTTP errors as plain exceptions, so the exception's
+    chain is searched for the one carrying the response.
+    """
+    while exc is not None:
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            try:
+                return float(headers.get("retry-after", ""))
+            except ValueError:
+                # Missing, or an HTTP date
+                return None
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
 def retry(
     max_attempts: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
-    on_retry: Union[Callable, None] = None
+    on_retry: Union[Callable, None] = None,
+    jitter: bool = False
 ):
     """Retry decorator with exponential backoff
 
@@ -36,6 +58,11 @@ def retry(
         exponential_base: Base for exponential backoff calculation
         exceptions: Tuple of exception types to catch and retry
         on_retry: Optional callback function called on each retry
+        jitter: Randomize each delay between half and all of its value, so
+            clients that failed together don't all retry together
+
+    Async generators (streaming calls) are retried only until they yield
+    their first item; errors after that are raised to the caller.
 
     Usage:
         @retry(max_attempts=3, initial_delay=2.0)
@@ -54,117 +81,109 @@ def retry(
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs) -> T:
+
+        def on_failure(attempt: int, e: Exception) -> float:
+            """Log a failed attempt and return the delay before the next one
+
+            Raises RetryError if this was the last attempt.
+            """
             logger = get_logger()
-            last_exception = None
 
-            for attempt in range(1, max_attempts + 1):
-                try:
-                    return await func(*args, **kwargs)
+            # Don't retry on last attempt
+            if attempt == max_attempts:
+                logger.error(
+                    f"All {max_attempts} retry attempts failed",
+                    function=func.__name__,
+                    error=str(e)
+                )
+                raise RetryError(
+                    f"Failed after {max_attempts} attempts: {str(e)}",
+                    last_exception=e
+                )
+
+            # Calculate delay with exponential backoff, but never retry
+            # sooner than the server asked to (Retry-After), up to max_delay
+            delay = min(
+                initial_delay * (exponential_base ** (attempt - 1)),
+                max_delay
+            )
+            if jitter:
+                delay *= random.uniform(0.5, 1.0)
+            retry_after = _retry_after(e)
+            if retry_after is not None:
+                delay = min(max(delay, retry_after), max_delay)
+
+            logger.warning(
+                f"Attempt {attempt}/{max_attempts} failed, retrying",
+                function=func.__name__,
+                delay=f"{delay:.1f}s",
+                error=str(e)
+            )
 
-                except exceptions as e:
-                    last_exception = e
-
-                    # Don't retry on last attempt
-                    if attempt == max_attempts:
-                        logger.error(
-                            f"All {max_attempts} retry attempts failed",
-                            function=func.__name__,
-                            error=str(e)
-                        )
-                        raise RetryError(
-                            f"Failed after {max_attempts} attempts: {str(e)}",
-                            last_exception=e
-                        )
-
-                    # Calculate delay with exponential backoff
-                    delay = min(
-                        initial_delay * (exponential_base ** (attempt - 1)),
-                        max_delay
+            # Call retry callback if provided
+            if on_retry:
+                try:
+                    on_retry(attempt, delay, e)
+                except Exception as callback_error:
+                    logger.debug(
+                        "Retry callback failed",
+                        error=str(callback_error)
                     )
 
-                    logger.warning(
-                        f"Attempt {attempt}/{max_attempts} failed, retrying",
-                        function=func.__name__,
-                        delay=f"{delay:.1f}s",
-                        error=str(e)
-                    )
+            return delay
 
-                    # Call retry callback if provided
-                    if on_retry:
-                        try:
-                            on_retry(attempt, delay, e)
-                        except Exception as callback_error:
-                            logger.debug(
-                                "Retry callback failed",
-                                error=str(callback_error)
-                            )
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs) -> T:
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
 
+                except exceptions as e:
                     # Wait before retrying
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(on_failure(attempt, e))
 
-            # Should never reach here, but just in case
-            raise RetryError(
-                f"Failed after {max_attempts} attempts",
-                last_exception=last_exception or Exception("Unknown error")
-            )
+        @functools.wraps(func)
+        async def asyncgen_wrapper(*args, **kwargs):
+            """Async generator version of retry wrapper
+
+            A failure before the first item starts the generator again. Once
+            an item has been yielded a retry would repeat output the caller
+            already has, so later errors propagate unchanged.
+            """
+            for attempt in range(1, max_attempts + 1):
+                agen = func(*args, **kwargs)
+                try:
+                    try:
+                        first = await agen.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    except exceptions as e:
+                        await asyncio.sleep(on_failure(attempt, e))
+                        continue
+
+                    yield first
+                    async for item in agen:
+                        yield item
+                    return
+                finally:
+                    await agen.aclose()
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> T:
             """Synchronous version of retry wrapper"""
             import time
-            logger = get_logger()
-            last_exception = None
 
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
 
                 except exceptions as e:
-                    last_exception = e
-
-                    if attempt == max_attempts:
-                        logger.error(
-                            f"All {max_attempts} retry attempts failed",
-                            function=func.__name__,
-                            error=str(e)
-                        )
-                        raise RetryError(
-                            f"Failed after {max_attempts} attempts: {str(e)}",
-                            last_exception=e
-                        )
-
-                    delay = min(
-                        initial_delay * (exponential_base ** (attempt - 1)),
-                        max_delay
-                    )
-
-                    logger.warning(
-                        f"Attempt {attempt}/{max_attempts} failed, retrying",
-                        function=func.__name__,
-                        delay=f"{delay:.1f}s",
-                        error=str(e)
-                    )
-
-                    if on_retry:
-                        try:
-                            on_retry(attempt, delay, e)
-                        except Exception as callback_error:
-                            logger.debug(
-                                "Retry callback failed",
-                                error=str(callback_error)
-                            )
-
-                    time.sleep(delay)
-
-            raise RetryError(
-                f"Failed after {max_attempts} attempts",
-                last_exception=last_exception or Exception("Unknown error")
-            )
+                    time.sleep(on_failure(attempt, e))
 
         # Return appropriate wrapper based on function type
-        if asyncio.iscoroutinefunction(func):
+        if inspect.isasyncgenfunction(func):
+            return asyncgen_wrapper
+        elif asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
             return sync_wrapper
@@ -178,13 +197,14 @@ def retry_api_call(func: Callable[..., T]) -> Callable[..., T]:
 
     - 4 attempts total
     - 2s initial delay
-    - Exponential backoff up to 16s
+    - Exponential backoff up to 16s, with jitter
     """
     return retry(
         max_attempts=4,
         initial_delay=2.0,
         max_delay=16.0,
-        exponential_base=2.0
+        exponential_base=2.0,
+        jitter=True
     )(func)
 
 
@@ -193,13 +213,14 @@ def retry_network(func: Callable[..., T]) -> Callable[..., T]:
 
     - 3 attempts total
     - 1s initial delay
-    - Exponential backoff up to 10s
+    - Exponential backoff up to 10s, with jitter
     """
     return retry(
         max_attempts=3,
         initial_delay=1.0,
         max_delay=10.0,
-        exponential_base=2.0
+        exponential_base=2.0,
+        jitter=True
     )(func)
 
 
@@ -10,6 +10,7 @@ This is the core engine that enables the iterative write-run-fix workflow:
 6. Repeat until success
 """
 
+import asyncio
 import json
 from pathlib import Path
 from typing import Any, AsyncIterator
@@ -19,6 +20,7 @@ from .core import Session, Message, TextPart, ToolPart, ToolState
 from .agents import Agent, BuildAgent
 from .tools import ToolRegistry, ToolContext
 from .providers import Provider
+from .providers.base import buffered_stream
 from .history import MessageHistory
 from .session_manager import SessionManager
 from .storage import Storage
@@ -246,12 +248,13 @@ class AgentRunner:
         # Save user message to history
         await self.history.save_message(self.session.id, user_message)
 
-        # Update session timestamp
+        # Update session timestamp, and build the conversation while the
+        # session file is being written (both only depend on the saved message)
         self.session.touch()
-        await self.session_manager.save_session(self.session)
-
-        # Build conversation
-        conversation = await self._build_conversation_history()
+        _, conversation = await asyncio.gather(
+            self.session_manager.save_session(self.session),
+            self._build_conversation_history(),
+        )
         conversation.append({"role": "user", "content": user_input})
 
         # Get tool definitions
@@ -278,22 +281,23 @@ class AgentRunner:
             )
 
             # Stream from LLM
-            accumulated_text = ""
+            text_chunks = []
             tool_calls = []
 
             # Determine model to use
             model_id = self.agent.config.model_id or "claude-3-5-sonnet-20241022"
 
             try:
-                async for event in self.provider.stream(
+                # Read the response ahead while text is being rendered
+                async for event in buffered_stream(self.provider.stream(
                     model=model_id,
                     messages=conversation,
                     system=system_prompt,
                     tools=tool_definitions,
-                ):
+                )):
                     if event.type == "text_delta":
                         text = event.data.get("text", "")
-                        accumulated_text += text
+                        text_chunks.append(text)
                         yield text  # Stream to user
 
                     elif event.type == "tool_use":
@@ -306,6 +310,7 @@ class AgentRunner:
                 break
 
             # Add text part if we got any text
+            accumulated_text = "".join(text_chunks)
             if accumulated_text:
                 self.current_message.add_part(TextPart(
                     session_id=self.session.id,
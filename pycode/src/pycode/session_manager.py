@@ -6,13 +6,18 @@ Essential for managing multiple projects.
 """
 
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 from datetime import datetime
-from .core import Session
+from .core import Message, Session
 from .storage import Storage
 from .history import MessageHistory
 
 
+def _last_activity_ms(session: Session, last_msg: Message | None) -> int:
+    """When a session was last active: its last message, else its creation"""
+    return last_msg.time_created if last_msg else session.time_created
+
+
 class SessionManager:
     """Manages coding sessions"""
 
@@ -70,65 +75,143 @@ class SessionManager:
 
         return None
 
-    async def list_sessions(
-        self, project_id: str | None = None, limit: int = 20
-    ) -> list[dict[str, Any]]:
+    async def load_sessions(self, session_ids: list[str]) -> dict[str, Session]:
+        """Load several sessions in one pass over the project directories
+
+        Returns a dict of session ID -> Session for the IDs that were found.
         """
-        List sessions with metadata
+        sessions_dir = self.storage.base_path / "sessions"
+        if not sessions_dir.exists():
+            return {}
 
-        Returns list of dicts with session info + message count
+        pending = set(session_ids)
+        found: dict[str, Session] = {}
+
+        for project_dir in sessions_dir.iterdir():
+            if not pending:
+                break
+            if not project_dir.is_dir():
+                continue
+
+            for session_id in list(pending):
+                session_file = project_dir / f"{session_id}.json"
+                if not session_file.exists():
+                    continue
+
+                session = self._read_session_file(session_file)
+                if session is not None:
+                    found[session_id] = session
+                    pending.discard(session_id)
+
+        return found
+
+    def _read_session_file(self, session_file: Path) -> Session | None:
+        """Read and validate a single session file"""
+        try:
+            import json
+
+            with open(session_file, "r") as f:
+                session_data = json.load(f)
+                session = Session.model_validate(session_data)
+        except Exception:
+            # Skip corrupted sessions
+            return None
+
+        return session
+
+    async def _session_activity(
+        self, session_file: Path
+    ) -> tuple[Session, Message | None] | None:
+        """Load one session file and its last message (None if unreadable)"""
+        session = self._read_session_file(session_file)
+        if session is None:
+            return None
+
+        try:
+            last_msg = await self.history.get_last_message(session.id)
+        except Exception:
+            return None
+
+        return session, last_msg
+
+    async def _session_info(self, session_file: Path, display: bool = False) -> dict[str, Any] | None:
+        """Load one session file and collect its metadata + message count
+
+        With display=True the dict also carries display-ready
+        "session_id_short", "message_count_text" and "last_activity_short"
+        (date and time) strings.
         """
+        activity = await self._session_activity(session_file)
+        if activity is None:
+            return None
+
+        return await self._describe_session(*activity, display)
+
+    async def _describe_session(
+        self, session: Session, last_msg: Message | None, display: bool = False
+    ) -> dict[str, Any] | None:
+        """Metadata + message count for a session whose last message is known"""
+        try:
+            # Get message count
+            msg_count = await self.history.get_message_count(session.id)
+        except Exception:
+            return None
+
+        last_activity = datetime.fromtimestamp(_last_activity_ms(session, last_msg) / 1000)
+
+        info = {
+            "session_id": session.id,
+            "project_id": session.project_id,
+            "title": session.title,
+            "directory": session.directory,
+            "created": datetime.fromtimestamp(session.time_created / 1000).isoformat(),
+            "updated": datetime.fromtimestamp(session.time_updated / 1000).isoformat(),
+            "last_activity": last_activity.isoformat(),
+            "message_count": msg_count,
+        }
+
+        if display:
+            info["session_id_short"] = session.id[:20] + "..."
+            info["message_count_text"] = str(msg_count)
+            info["last_activity_short"] = last_activity.isoformat(timespec="seconds")
+
+        return info
+
+    def _session_files(self, project_id: str | None = None) -> list[Path]:
+        """Collect session files, optionally restricted to one project"""
         sessions_dir = self.storage.base_path / "sessions"
         if not sessions_dir.exists():
             return []
 
-        sessions_info = []
-
         # Get projects to search
         if project_id:
             project_dirs = [sessions_dir / project_id]
         else:
             project_dirs = [d for d in sessions_dir.iterdir() if d.is_dir()]
 
+        session_files = []
         for project_dir in project_dirs:
             if not project_dir.exists():
                 continue
+            session_files.extend(project_dir.glob("*.json"))
 
-            # Load all session files
-            for session_file in project_dir.glob("*.json"):
-                try:
-                    import json
-
-                    with open(session_file, "r") as f:
-                        session_data = json.load(f)
-                        session = Session.model_validate(session_data)
-
-                    # Get message count
-                    msg_count = await self.history.get_message_count(session.id)
-
-                    # Get last message time
-                    last_msg = await self.history.get_last_message(session.id)
-                    last_activity = (
-                        datetime.fromtimestamp(last_msg.time_created / 1000).isoformat()
-                        if last_msg
-                        else datetime.fromtimestamp(session.time_created / 1000).isoformat()
-                    )
-
-                    sessions_info.append(
-                        {
-                            "session_id": session.id,
-                            "project_id": session.project_id,
-                            "title": session.title,
-                            "directory": session.directory,
-                            "created": datetime.fromtimestamp(session.time_created / 1000).isoformat(),
-                            "updated": datetime.fromtimestamp(session.time_updated / 1000).isoformat(),
-                            "last_activity": last_activity,
-                            "message_count": msg_count,
-                        }
-                    )
-                except Exception:
-                    # Skip corrupted sessions
-                    continue
+        return session_files
+
+    async def list_sessions(
+        self, project_id: str | None = None, limit: int = 20, display: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        List sessions with metadata
+
+        Returns list of dicts with session info + message count
+        (plus short display fields when display=True)
+        """
+        sessions_info = []
+
+        for session_file in self._session_files(project_id):
+            info = await self._session_info(session_file, display)
+            if info is not None:
+                sessions_info.append(info)
 
         # Sort by last activity (most recent first)
         sessions_info.sort(key=lambda x: x["last_activity"], reverse=True)
@@ -136,6 +219,56 @@ class SessionManager:
         # Apply limit
         return sessions_info[:limit]
 
+    async def load_all_sessions(
+        self, project_id: str | None = None, limit: int = 20
+    ) -> list[Session]:
+        """
+        Load sessions without any per-session history lookups
+
+        Returns Session objects, most recently updated first.
+        """
+        sessions = []
+        for session_file in self._session_files(project_id):
+            session = self._read_session_file(session_file)
+            if session is not None:
+                sessions.append(session)
+
+        sessions.sort(key=lambda s: s.time_updated, reverse=True)
+
+        return sessions[:limit]
+
+    async def iter_sessions(
+        self, project_id: str | None = None, limit: int = 20, display: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield session metadata one session at a time
+
+        Same dicts, in the same order, as list_sessions(), but each one is
+        yielded as soon as it is described so callers can render
+        incrementally. Only the last message of each session is read to
+        order them; messages are counted just for the sessions yielded.
+        """
+        activities = []
+        for session_file in self._session_files(project_id):
+            activity = await self._session_activity(session_file)
+            if activity is not None:
+                activities.append(activity)
+
+        # Last activity, most recent first
+        activities.sort(key=lambda a: _last_activity_ms(*a), reverse=True)
+
+        count = 0
+        for session, last_msg in activities:
+            if count >= limit:
+                break
+
+            info = await self._describe_session(session, last_msg, display)
+            if info is None:
+                continue
+
+            count += 1
+            yield info
+
     async def delete_session(self, session_id: str, project_id: str) -> bool:
         """Delete a session and its history"""
         # Delete session file
@@ -148,6 +281,17 @@ class SessionManager:
 
         return True
 
+    async def delete_sessions(self, sessions: list[Session]) -> list[str]:
+        """Delete several sessions and their history
+
+        Returns the IDs of the deleted sessions.
+        """
+        deleted = []
+        for session in sessions:
+            await self.delete_session(session.id, session.project_id)
+            deleted.append(session.id)
+        return deleted
+
     async def get_recent_session(self, project_id: str | None = None) -> Session | None:
         """Get the most recently active session"""
         sessions = await self.list_sessions(project_id, limit=1)
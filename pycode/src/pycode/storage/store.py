@@ -1,9 +1,24 @@
 """File-based JSON storage"""
 
+import asyncio
+import gzip
 import json
+import os
 import aiofiles
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+
+def _ends_unterminated(path: Path) -> bool:
+    """Whether the file at path is non-empty and its last byte isn't a newline"""
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except FileNotFoundError:
+        return False
 
 
 class Storage:
@@ -12,12 +27,17 @@ class Storage:
     Similar to OpenCode's storage system.
     """
 
+    # Active logs past this size are compressed into a sealed segment
+    LOG_SEAL_BYTES = 1024 * 1024
+
     def __init__(self, base_path: Path | None = None):
         if base_path is None:
             base_path = Path.home() / ".pycode" / "storage"
 
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Log path -> lock serializing appends with sealing of that log
+        self._log_locks: dict[Path, asyncio.Lock] = {}
 
     def _get_file_path(self, key: list[str]) -> Path:
         """Convert hierarchical key to file path"""
@@ -31,6 +51,10 @@ class Storage:
         filename = key[-1] + ".json"
         return path / filename
 
+    def _get_log_path(self, key: list[str]) -> Path:
+        """Convert hierarchical key to an append-only .jsonl log path"""
+        return self._get_file_path(key).with_suffix(".jsonl")
+
     async def write(self, key: list[str], data: Any) -> None:
         """Write data to storage"""
         file_path = self._get_file_path(key)
@@ -54,6 +78,156 @@ class Storage:
             content = await f.read()
             return json.loads(content)
 
+    def _sealed_log_paths(self, log_path: Path) -> list[Path]:
+        """Compressed segments of a log, oldest first"""
+        prefix = log_path.stem + "."
+        try:
+            with os.scandir(log_path.parent) as entries:
+                names = sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.name.startswith(prefix) and entry.name.endswith(".jsonl.gz")
+                )
+        except FileNotFoundError:
+            return []
+        return [log_path.parent / name for name in names]
+
+    def _seal_log(self, log_path: Path) -> None:
+        """Compress the active log into the next segment and empty it"""
+        sealed = self._sealed_log_paths(log_path)
+        number = int(sealed[-1].name.split(".")[-3]) + 1 if sealed else 1
+        segment = log_path.with_name(f"{log_path.stem}.{number:06d}.jsonl.gz")
+
+        tmp_path = segment.with_name(segment.name + ".tmp")
+        tmp_path.write_bytes(gzip.compress(log_path.read_bytes(), compresslevel=6))
+        os.replace(tmp_path, segment)
+        # Truncate rather than delete, so the active log always exists
+        log_path.write_bytes(b"")
+
+    async def append(self, key: list[str], data: Any) -> None:
+        """
+        Append data as one JSON line to the log at key
+
+        Once the active log grows past LOG_SEAL_BYTES it is compressed into
+        a sealed segment; readers see sealed and active lines as one log.
+        """
+        file_path = self._get_log_path(key)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Pydantic models serialize straight to JSON
+        if hasattr(data, "model_dump_json"):
+            line = data.model_dump_json()
+        else:
+            line = json.dumps(data, separators=(",", ":"))
+
+        # Same bytes on every platform: UTF-8 (model_dump_json keeps
+        # non-ASCII text as is) and untranslated "\n" line ends. The log is
+        # read back as bytes, which the JSON parsers decode as UTF-8.
+        lock = self._log_locks.get(file_path)
+        first_append = lock is None
+        if first_append:
+            lock = self._log_locks[file_path] = asyncio.Lock()
+
+        async with lock:
+            # A write interrupted in an earlier run leaves an unterminated
+            # line; end it first so this line doesn't get glued onto it
+            if first_append and _ends_unterminated(file_path):
+                line = "\n" + line
+
+            async with aiofiles.open(file_path, "a", encoding="utf-8", newline="") as f:
+                await f.write(line + "\n")
+                size = await f.tell()
+
+            if size > self.LOG_SEAL_BYTES:
+                # Compression takes a while; keep it off the event loop. The
+                # lock holds back appends that would land between reading
+                # the log and truncating it.
+                await asyncio.to_thread(self._seal_log, file_path)
+
+    async def read_lines(self, key: list[str]) -> list[bytes]:
+        """Read every complete line of the log at key, sealed segments first"""
+        return await asyncio.to_thread(self.read_lines_sync, key)
+
+    def read_lines_sync(self, key: list[str]) -> list[bytes]:
+        """Blocking version of read_lines(), for callers already off the loop"""
+        file_path = self._get_log_path(key)
+
+        # Active file before segments: if a seal happens in between, its
+        # lines show up twice (readers keep the last copy of each message)
+        # rather than not at all
+        try:
+            active = file_path.read_bytes()
+        except FileNotFoundError:
+            active = b""
+
+        lines = []
+        for segment in self._sealed_log_paths(file_path):
+            lines.extend(gzip.decompress(segment.read_bytes()).splitlines())
+        # Text after the last "\n" is a write that hasn't finished (or never
+        # will, if it was interrupted)
+        lines.extend(active[:active.rfind(b"\n") + 1].splitlines())
+
+        return lines
+
+    def iter_lines_reversed(
+        self, key: list[str], block_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """
+        Yield the lines of the log at key, last line first
+
+        The active file is read backwards in blocks, so a caller that only
+        needs the last few lines never reads the rest of the log. Sealed
+        segments are only decompressed once the active file is exhausted.
+        Like read_lines(), an unterminated last line is left out.
+        """
+        file_path = self._get_log_path(key)
+
+        try:
+            f = open(file_path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
+                position = f.seek(0, os.SEEK_END)
+                # Start of the earliest line seen so far, possibly incomplete
+                head = b""
+                # Still inside the text after the last "\n"
+                in_tail = True
+                while position > 0:
+                    read_size = min(block_size, position)
+                    position -= read_size
+                    f.seek(position)
+                    block = f.read(read_size) + head
+                    if in_tail:
+                        end = block.rfind(b"\n")
+                        if end == -1:
+                            continue
+                        block = block[:end]
+                        in_tail = False
+                    lines = block.split(b"\n")
+                    head = lines.pop(0)
+                    for line in reversed(lines):
+                        if line:
+                            yield line
+
+                if head:
+                    yield head
+
+        for segment in reversed(self._sealed_log_paths(file_path)):
+            for line in reversed(gzip.decompress(segment.read_bytes()).splitlines()):
+                if line:
+                    yield line
+
+    async def delete_log(self, key: list[str]) -> None:
+        """Delete the log at key, including its sealed segments"""
+        file_path = self._get_log_path(key)
+
+        for segment in self._sealed_log_paths(file_path):
+            segment.unlink()
+
+        if file_path.exists():
+            file_path.unlink()
+
     async def delete(self, key: list[str]) -> None:
         """Delete data from storage"""
         file_path = self._get_file_path(key)
@@ -77,6 +251,16 @@ class Storage:
 
         return keys
 
+    async def count_sessions(self) -> int:
+        """Count stored sessions without reading them"""
+        # Sessions live at sessions/<project>/<session>.json; message logs
+        # (sessions/<session>/messages.jsonl) don't match *.json
+        path = self.base_path / "sessions"
+        if not path.exists():
+            return 0
+
+        return sum(1 for _ in path.glob("*/*.json"))
+
     async def exists(self, key: list[str]) -> bool:
         """Check if key exists"""
         file_path = self._get_file_path(key)
@@ -83,7 +83,7 @@ class ToolApprovalManager:
         try:
             args_json = json.dumps(tool_args, sort_keys=True)
             return f"{tool_name}:{args_json}"
-        except:
+        except Exception:
             return f"{tool_name}:unknown"
 
     def _prompt_user(self, tool_name: str, tool_args: dict) -> ToolApprovalDecision:
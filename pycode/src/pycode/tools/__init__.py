@@ -1,5 +1,7 @@
 """Tool system"""
 
+import functools
+
 from .base import Tool, ToolContext, ToolResult, ToolRegistry
 from .bash import BashTool
 from .read import ReadTool
@@ -17,11 +19,42 @@ from .ask import AskTool
 from .todo import TodoTool
 from .codesearch import CodeSearchTool
 
+
+@functools.lru_cache(maxsize=1)
+def default_registry() -> ToolRegistry:
+    """Process-wide registry with every built-in tool registered
+
+    Shared by all callers, so don't register/unregister on it directly;
+    build a separate ToolRegistry for one that can be changed.
+    """
+    registry = ToolRegistry()
+    for tool_class in (
+        BashTool,
+        ReadTool,
+        EditTool,
+        GrepTool,
+        WriteTool,
+        GlobTool,
+        LsTool,
+        WebFetchTool,
+        GitTool,
+        MultiEditTool,
+        SnapshotTool,
+        PatchTool,
+        AskTool,
+        TodoTool,
+        CodeSearchTool,
+    ):
+        registry.register(tool_class())
+    return registry
+
+
 __all__ = [
     "Tool",
     "ToolContext",
     "ToolResult",
     "ToolRegistry",
+    "default_registry",
     "BashTool",
     "ReadTool",
     "EditTool",
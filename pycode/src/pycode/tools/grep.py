@@ -52,7 +52,7 @@ The tool will use ripgrep (rg) if available, otherwise falls back to grep.
             )
             await process.communicate()
             return process.returncode == 0
-        except:
+        except Exception:
             return False
 
     async def execute(self, parameters: dict, context: ToolContext) -> ToolResult:
@@ -89,7 +89,7 @@ IMPORTANT:
             with open(todo_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 return data.get("todos", [])
-        except:
+        except Exception:
             return []
 
     def _save_todos(self, session_id: str, todos: list[dict]) -> None:
@@ -77,7 +77,7 @@ IMPORTANT:
                     with open(file_path, "r", encoding="utf-8") as f:
                         old_content = f.read()
                     old_lines = len(old_content.splitlines())
-                except:
+                except Exception:
                     old_lines = 0
             else:
                 old_lines = 0
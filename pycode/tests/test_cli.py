@@ -0,0 +1,103 @@
+"""Tests for CLI argument parsing"""
+
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode import __version__
+from pycode.cli.main import PyCodeCLI, _build_parser, _sniff_subcommand
+
+
+class TestSniffSubcommand:
+    """Test finding the subcommand before argparse runs"""
+
+    def test_plain_command(self):
+        """Test a command given first"""
+        assert _sniff_subcommand(["run", "fix", "the", "bug"]) == "run"
+        assert _sniff_subcommand(["session", "list"]) == "session"
+
+    def test_options_before_command(self):
+        """Test that global options and their values are skipped"""
+        assert _sniff_subcommand(["--log-level", "debug", "models"]) == "models"
+        assert _sniff_subcommand(["--config", "cfg.yaml", "--log-file", "out.log", "run", "hi"]) == "run"
+
+    def test_option_value_named_like_command(self):
+        """Test that an option value equal to a command name isn't taken as the command"""
+        assert _sniff_subcommand(["--config", "run", "models"]) == "models"
+        assert _sniff_subcommand(["--config", "run"]) is None
+
+    def test_no_command(self):
+        """Test argv without a command"""
+        assert _sniff_subcommand([]) is None
+        assert _sniff_subcommand(["--log-level", "debug"]) is None
+
+    def test_unknown_command(self):
+        """Test that an unknown command falls back to the full parser"""
+        assert _sniff_subcommand(["frobnicate"]) is None
+        assert _sniff_subcommand(["--log-level", "debug", "frobnicate", "run"]) is None
+
+    def test_help_and_version(self):
+        """Test that top-level help and --version need the full parser"""
+        assert _sniff_subcommand(["--help", "run"]) is None
+        assert _sniff_subcommand(["-h"]) is None
+        assert _sniff_subcommand(["--version"]) is None
+        # Help after the command is the command's own help
+        assert _sniff_subcommand(["run", "--help"]) == "run"
+
+
+class TestBuildParser:
+    """Test parsing with the parser built for the sniffed command"""
+
+    def parse(self, argv):
+        return PyCodeCLI(argv).parser.parse_args(argv)
+
+    def test_options_before_command(self):
+        """Test global options placed before the subcommand"""
+        args = self.parse(["--config", "cfg.yaml", "--log-level", "debug", "run", "--agent", "plan", "fix", "it"])
+
+        assert args.command == "run"
+        assert args.config == Path("cfg.yaml")
+        assert args.log_level == "debug"
+        assert args.agent == "plan"
+        assert args.message == ["fix", "it"]
+
+    def test_nested_command(self):
+        """Test a command with its own subcommands"""
+        args = self.parse(["session", "delete", "session_abc"])
+
+        assert args.command == "session"
+        assert args.session_command == "delete"
+        assert args.session_id == "session_abc"
+
+    def test_no_command(self):
+        """Test that no command parses to command None"""
+        args = self.parse(["--log-level", "quiet"])
+
+        assert args.command is None
+        assert args.log_level == "quiet"
+
+    def test_version(self, capsys):
+        """Test that --version prints the version and exits"""
+        with pytest.raises(SystemExit) as exc_info:
+            self.parse(["--version"])
+
+        assert exc_info.value.code == 0
+        assert __version__ in capsys.readouterr().out
+
+    def test_unknown_command(self, capsys):
+        """Test that an unknown command is a usage error listing the commands"""
+        with pytest.raises(SystemExit) as exc_info:
+            self.parse(["frobnicate"])
+
+        assert exc_info.value.code == 2
+        err = capsys.readouterr().err
+        assert "frobnicate" in err
+        assert "run" in err
+
+    def test_parser_cached_per_command(self):
+        """Test that parsers are built once per command"""
+        assert _build_parser("run") is _build_parser("run")
+        assert _build_parser("run") is not _build_parser("models")
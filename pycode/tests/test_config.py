@@ -0,0 +1,105 @@
+"""Tests for configuration loading and caching"""
+
+import os
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.config import ConfigManager
+
+
+CONFIG_YAML = """\
+storage_path: /tmp/pycode-test
+enabled_tools: [read, grep]
+agents:
+  build:
+    name: build
+    enabled_tools: [read]
+"""
+
+
+def rewrite(path, text: str) -> None:
+    """Rewrite a config file and move its mtime forward
+
+    The mtime is set explicitly, since a quick rewrite can land within the
+    filesystem's timestamp resolution.
+    """
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+
+
+class TestConfigCache:
+    """Test the parsed-config cache shared between managers"""
+
+    def test_managers_share_parse(self, temp_file):
+        """Test that a second manager on the same file gets the same values"""
+        path = temp_file("config.yaml", CONFIG_YAML)
+
+        first = ConfigManager(path).load()
+        second = ConfigManager(path).load()
+
+        assert second == first
+        assert second.enabled_tools == ["read", "grep"]
+
+    def test_managers_do_not_share_objects(self, temp_file):
+        """Test that changing one manager's config leaves the others alone"""
+        path = temp_file("config.yaml", CONFIG_YAML)
+
+        first = ConfigManager(path).load()
+        first.enabled_tools.append("bash")
+        first.agents["build"].enabled_tools.append("write")
+        first.storage_path = "/elsewhere"
+
+        second = ConfigManager(path).load()
+        third = ConfigManager(path).load()
+
+        assert second.enabled_tools == ["read", "grep"]
+        assert second.agents["build"].enabled_tools == ["read"]
+        assert second.storage_path == "/tmp/pycode-test"
+        assert third is not second
+
+
+class TestConfigReload:
+    """Test picking up edits to the config file"""
+
+    def test_unchanged_file_reused(self, temp_file):
+        """Test that an unchanged file isn't parsed again"""
+        manager = ConfigManager(temp_file("config.yaml", CONFIG_YAML))
+
+        assert manager.load() is manager.load()
+
+    def test_changed_file_reloaded(self, temp_file):
+        """Test that an edit is seen once the file's mtime changes"""
+        path = temp_file("config.yaml", CONFIG_YAML)
+        manager = ConfigManager(path)
+        assert manager.load().storage_path == "/tmp/pycode-test"
+
+        rewrite(path, CONFIG_YAML.replace("/tmp/pycode-test", "/tmp/pycode-edited"))
+
+        assert manager.load().storage_path == "/tmp/pycode-edited"
+        assert ConfigManager(path).load().storage_path == "/tmp/pycode-edited"
+
+    def test_failed_file_reread_after_fix(self, temp_file):
+        """Test that a file that failed to load is read again once it changes"""
+        path = temp_file("config.yaml", "enabled_tools: [read\n")
+        manager = ConfigManager(path)
+
+        # Broken YAML: defaults, until the file is fixed
+        assert manager.load().storage_path == "~/.pycode/storage"
+        assert manager.load().storage_path == "~/.pycode/storage"
+
+        rewrite(path, CONFIG_YAML)
+
+        assert manager.load().storage_path == "/tmp/pycode-test"
+
+    def test_invalid_file_reread_after_fix(self, temp_file):
+        """Test that a file failing validation is read again once it changes"""
+        path = temp_file("config.yaml", "runtime:\n  max_iterations: lots\n")
+        manager = ConfigManager(path)
+
+        assert manager.load().runtime.max_iterations == 10
+
+        rewrite(path, "runtime:\n  max_iterations: 3\n")
+
+        assert manager.load().runtime.max_iterations == 3
@@ -0,0 +1,149 @@
+"""Tests for message history on top of the append-only message log"""
+
+import pytest
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.core import Message, TextPart
+from pycode import history as history_module
+from pycode.history import ContextManager, MessageHistory
+from pycode.storage import Storage
+
+
+def make_message(session_id: str, text: str, **kwargs) -> Message:
+    """User message with one text part"""
+    message = Message(session_id=session_id, role="user", **kwargs)
+    message.add_part(TextPart(session_id=session_id, message_id=message.id, text=text))
+    return message
+
+
+@pytest.fixture
+def history(temp_dir):
+    """MessageHistory on an empty storage directory"""
+    return MessageHistory(Storage(temp_dir))
+
+
+class TestMessageCounts:
+    """Test message counting"""
+
+    @pytest.mark.asyncio
+    async def test_count_messages_bulk(self, history):
+        """Test counts for several sessions, including one without messages"""
+        for i in range(3):
+            await history.save_message("session_a", make_message("session_a", f"a{i}"))
+        await history.save_message("session_b", make_message("session_b", "b0"))
+
+        counts = await history.count_messages_bulk(["session_a", "session_b", "session_empty"])
+
+        assert counts == {"session_a": 3, "session_b": 1, "session_empty": 0}
+
+    @pytest.mark.asyncio
+    async def test_count_messages_bulk_ignores_resaves(self, history):
+        """Test that a re-saved message is counted once"""
+        message = make_message("session_a", "first")
+        await history.save_message("session_a", message)
+        message.add_part(TextPart(session_id="session_a", message_id=message.id, text="more"))
+        await history.save_message("session_a", message)
+
+        counts = await history.count_messages_bulk(["session_a"])
+
+        assert counts == {"session_a": 1}
+        assert await history.get_message_count("session_a") == 1
+
+    @pytest.mark.asyncio
+    async def test_count_messages_bulk_no_storage(self, history):
+        """Test counting before any session was saved"""
+        counts = await history.count_messages_bulk(["session_a"])
+        assert counts == {"session_a": 0}
+
+
+class TestMessageLog:
+    """Test saving and loading through the message log"""
+
+    @pytest.mark.asyncio
+    async def test_save_load_round_trip(self, history):
+        """Test that saved messages load back in order"""
+        messages = [make_message("session_a", f"m{i}") for i in range(3)]
+        for message in messages:
+            await history.save_message("session_a", message)
+
+        loaded = await history.load_messages("session_a")
+
+        assert [m.id for m in loaded] == [m.id for m in messages]
+        assert [m.get_text_content() for m in loaded] == ["m0", "m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_resaved_message_latest_version(self, history):
+        """Test that a re-saved message loads once, as its last saved version"""
+        first = make_message("session_a", "first")
+        await history.save_message("session_a", first)
+        growing = make_message("session_a", "v1")
+        await history.save_message("session_a", growing)
+        growing.add_part(TextPart(session_id="session_a", message_id=growing.id, text="v2"))
+        await history.save_message("session_a", growing)
+
+        loaded = await history.load_messages("session_a")
+        recent = await history.load_messages("session_a", limit=1)
+
+        assert [m.get_text_content() for m in loaded] == ["first", "v1\nv2"]
+        assert [m.get_text_content() for m in recent] == ["v1\nv2"]
+        assert await history.get_message_count("session_a") == 2
+
+
+class TestLegacyMigration:
+    """Test folding one-file-per-message directories into the log"""
+
+    @staticmethod
+    def write_legacy(history, session_id: str, messages: list[Message]):
+        """Write messages in the old per-message file layout"""
+        legacy_dir = history.storage.base_path / "sessions" / session_id.removeprefix("session_") / "messages"
+        legacy_dir.mkdir(parents=True)
+        for message in messages:
+            (legacy_dir / f"{message.id}.json").write_text(message.model_dump_json())
+        return legacy_dir
+
+    @pytest.mark.asyncio
+    async def test_migrate_legacy_messages(self, history):
+        """Test that legacy files move into the log and the directory goes"""
+        messages = [make_message("session_a", f"m{i}") for i in range(3)]
+        legacy_dir = self.write_legacy(history, "session_a", messages)
+
+        loaded = await history.load_messages("session_a")
+
+        assert [m.id for m in loaded] == [m.id for m in messages]
+        assert not legacy_dir.exists()
+        # Migrated once; loading again doesn't duplicate anything
+        assert await history.get_message_count("session_a") == 3
+
+    @pytest.mark.asyncio
+    async def test_migrate_corrupt_legacy_message(self, history):
+        """Test that an unreadable legacy file is kept as *.corrupt"""
+        messages = [make_message("session_a", f"m{i}") for i in range(2)]
+        legacy_dir = self.write_legacy(history, "session_a", messages)
+        (legacy_dir / "message_broken.json").write_text("{not json")
+
+        loaded = await history.load_messages("session_a")
+
+        assert [m.id for m in loaded] == [m.id for m in messages]
+        assert sorted(p.name for p in legacy_dir.iterdir()) == ["message_broken.json.corrupt"]
+
+        # Later reads neither re-add the migrated messages nor drop the file
+        assert await history.get_message_count("session_a") == 2
+        assert (legacy_dir / "message_broken.json.corrupt").exists()
+
+
+class TestContextManager:
+    """Test token counting for pruning"""
+
+    def test_token_cache_bounded(self, monkeypatch):
+        """Test that the token cache stops growing at its size limit"""
+        monkeypatch.setattr(history_module, "_TOKEN_CACHE_SIZE", 8)
+        context = ContextManager()
+
+        conversation = [{"role": "user", "content": f"message {i}"} for i in range(20)]
+        counts = [context._message_tokens(message) for message in conversation]
+
+        assert len(context._token_cache) == 8
+        # Evicted counts are recomputed the same
+        assert [context._message_tokens(message) for message in conversation] == counts
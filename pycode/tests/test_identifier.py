@@ -0,0 +1,66 @@
+"""Tests for identifier generation"""
+
+import time
+
+import pytest
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.core.identifier import Identifier, _ulid_str
+
+
+class TestUlidFormat:
+    """Test the hand-written ULID encoder"""
+
+    def test_timestamp_round_trip(self):
+        """Test that the encoded timestamp is read back unchanged"""
+        for timestamp_ms in (0, 1, 1_700_000_000_123, time.time_ns() // 1_000_000, 2**48 - 1):
+            identifier = f"message_{_ulid_str(timestamp_ms)}"
+            assert Identifier.extract_timestamp(identifier) == timestamp_ms
+
+    def test_known_values(self):
+        """Test against ULIDs from the ULID spec"""
+        assert _ulid_str(0, 0) == "0" * 26
+        assert _ulid_str(2**48 - 1, 2**80 - 1) == "7" + "Z" * 25
+        assert Identifier.extract_timestamp("message_01ARYZ6S41TSV4RRFFQ69G5FAV") == 1469918176385
+
+    def test_invalid_identifier(self):
+        """Test that malformed identifiers are rejected"""
+        for identifier in ("message", "message_short", "message_" + "U" * 26):
+            with pytest.raises(ValueError):
+                Identifier.extract_timestamp(identifier)
+
+    def test_format(self):
+        """Test length and alphabet"""
+        value = _ulid_str(time.time_ns() // 1_000_000)
+        assert len(value) == 26
+        assert set(value) <= set("0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+
+class TestIdentifier:
+    """Test Identifier"""
+
+    def test_ascending_sorted(self):
+        """Test that IDs created one after another sort in creation order"""
+        ids = [Identifier.ascending("part") for _ in range(1000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_ascending_timestamp(self):
+        """Test that an ascending ID carries the current time"""
+        before = time.time_ns() // 1_000_000
+        identifier = Identifier.ascending("message")
+        after = time.time_ns() // 1_000_000
+
+        assert identifier.startswith("message_")
+        assert before <= Identifier.extract_timestamp(identifier) <= after + 1
+
+    def test_descending_newer_sorts_first(self):
+        """Test that a session created later sorts before an earlier one"""
+        older = Identifier.descending()
+        time.sleep(0.002)
+        newer = Identifier.descending()
+
+        assert newer < older
@@ -0,0 +1,92 @@
+"""Tests for Message part accessors"""
+
+from dataclasses import dataclass
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.core import Message, TextPart
+
+
+def text_part(message: Message, text: str) -> TextPart:
+    """Text part belonging to message"""
+    return TextPart(session_id=message.session_id, message_id=message.id, text=text)
+
+
+def make_message(*texts: str) -> Message:
+    """User message with one text part per text"""
+    message = Message(session_id="session_test", role="user")
+    for text in texts:
+        message.add_part(text_part(message, text))
+    return message
+
+
+class TestMessageParts:
+    """Test text and tool part accessors"""
+
+    def test_text_content(self):
+        """Test combining text parts, leaving out ignored ones"""
+        message = make_message("a", "b")
+        ignored = text_part(message, "hidden")
+        ignored.ignored = True
+        message.add_part(ignored)
+
+        assert message.get_text_content() == "a\nb"
+        assert len(message.get_text_parts()) == 3
+        assert message.get_tool_parts() == []
+
+    def test_replaced_part(self):
+        """Test that replacing a part in place is seen"""
+        message = make_message("a")
+        message.get_text_content()
+
+        message.parts[0] = text_part(message, "REPLACED")
+
+        assert message.get_text_content() == "REPLACED"
+
+    def test_reassigned_parts(self):
+        """Test that assigning a new parts list is seen"""
+        message = make_message("a")
+        message.get_text_content()
+
+        message.parts = [text_part(message, "new")]
+
+        assert message.get_text_content() == "new"
+
+    def test_copy_does_not_share_parts(self):
+        """Test that adding to a copy leaves the original alone"""
+        original = make_message("a")
+        original.get_text_content()
+
+        copy = original.model_copy(deep=True)
+        copy.add_part(text_part(copy, "b"))
+
+        assert original.get_text_content() == "a"
+        assert copy.get_text_content() == "a\nb"
+
+    def test_shallow_copy_no_duplicates(self):
+        """Test that a shallow copy sharing the parts list reports each part once"""
+        original = make_message("a")
+        original.get_text_content()
+
+        copy = original.model_copy()
+        copy.add_part(text_part(copy, "b"))
+
+        # model_copy() shares the parts list, so both see the new part once
+        assert copy.get_text_content() == "a\nb"
+        assert original.get_text_content() == "a\nb"
+
+    def test_text_part_subclass(self):
+        """Test that subclasses of TextPart count as text parts"""
+
+        @dataclass(slots=True, kw_only=True)
+        class QuotedTextPart(TextPart):
+            source: str = ""
+
+        message = make_message("a")
+        message.add_part(
+            QuotedTextPart(session_id=message.session_id, message_id=message.id, text="q")
+        )
+
+        assert message.get_text_content() == "a\nq"
+        assert len(message.get_text_parts()) == 2
@@ -120,6 +120,87 @@ class TestRetryDecorator:
         assert result == "sync result"
         assert call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_retry_async_generator_before_first_item(self):
+        """Test that a stream failing before its first item is restarted"""
+        call_count = 0
+
+        @retry(max_attempts=3, initial_delay=0.01)
+        async def flaky_stream():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 2:
+                raise ValueError("Connection reset")
+            yield "a"
+            yield "b"
+
+        items = [item async for item in flaky_stream()]
+        assert items == ["a", "b"]
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_async_generator_mid_stream(self):
+        """Test that a stream failing after its first item is not restarted"""
+        call_count = 0
+        items = []
+
+        @retry(max_attempts=3, initial_delay=0.01)
+        async def broken_stream():
+            nonlocal call_count
+            call_count += 1
+            yield "a"
+            raise ValueError("Connection reset")
+
+        with pytest.raises(ValueError):
+            async for item in broken_stream():
+                items.append(item)
+
+        assert items == ["a"]
+        assert call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_honors_retry_after(self):
+        """Test that a Retry-After header sets the minimum delay"""
+        delays = []
+
+        class RateLimited(Exception):
+            response = Mock(headers={"retry-after": "0.05"})
+
+        @retry(
+            max_attempts=2,
+            initial_delay=0.01,
+            on_retry=lambda attempt, delay, exc: delays.append(delay)
+        )
+        async def rate_limited():
+            if not delays:
+                raise RateLimited()
+            return "success"
+
+        assert await rate_limited() == "success"
+        assert delays == [0.05]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_capped_at_max_delay(self):
+        """Test that a huge Retry-After header waits no longer than max_delay"""
+        delays = []
+
+        class RateLimited(Exception):
+            response = Mock(headers={"retry-after": "86400"})
+
+        @retry(
+            max_attempts=2,
+            initial_delay=0.01,
+            max_delay=0.05,
+            on_retry=lambda attempt, delay, exc: delays.append(delay)
+        )
+        async def rate_limited():
+            if not delays:
+                raise RateLimited()
+            return "success"
+
+        assert await rate_limited() == "success"
+        assert delays == [0.05]
+
 
 class TestRetryStrategies:
     """Test predefined retry strategies"""
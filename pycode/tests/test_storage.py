@@ -0,0 +1,136 @@
+"""Tests for the append-only message log in file storage"""
+
+import gzip
+import json
+
+import pytest
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.storage import Storage
+
+
+KEY = ["sessions", "abc", "messages"]
+
+
+@pytest.fixture
+def storage(temp_dir):
+    """Storage on an empty directory"""
+    return Storage(temp_dir)
+
+
+def log_path(storage: Storage):
+    """Path of the active log at KEY"""
+    return storage.base_path / "sessions" / "abc" / "messages.jsonl"
+
+
+class TestMessageLog:
+    """Test appending and reading the log"""
+
+    @pytest.mark.asyncio
+    async def test_append_read_round_trip(self, storage):
+        """Test that appended records come back in order, non-ASCII included"""
+        records = [{"id": "m1", "text": "hello"}, {"id": "m2", "text": "héllo ✓ 你好"}]
+        for record in records:
+            await storage.append(KEY, record)
+
+        lines = await storage.read_lines(KEY)
+
+        assert [json.loads(line) for line in lines] == records
+        # Written as UTF-8 with plain "\n" line ends on every platform
+        assert log_path(storage).read_bytes().decode("utf-8").count("\n") == 2
+
+    @pytest.mark.asyncio
+    async def test_read_missing_log(self, storage):
+        """Test reading a log that was never written"""
+        assert await storage.read_lines(KEY) == []
+        assert list(storage.iter_lines_reversed(KEY)) == []
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_reversed(self, storage):
+        """Test reading the log backwards across several blocks"""
+        for i in range(50):
+            await storage.append(KEY, {"id": f"m{i}"})
+
+        lines = list(storage.iter_lines_reversed(KEY, block_size=16))
+
+        assert [json.loads(line)["id"] for line in lines] == [f"m{i}" for i in reversed(range(50))]
+
+    @pytest.mark.asyncio
+    async def test_partial_last_line(self, storage):
+        """Test that an unterminated last line (interrupted write) is left out"""
+        await storage.append(KEY, {"id": "m1"})
+        await storage.append(KEY, {"id": "m2"})
+        with open(log_path(storage), "ab") as f:
+            f.write(b'{"id":"m3","te')
+
+        for block_size in (8, 64 * 1024):
+            lines = list(storage.iter_lines_reversed(KEY, block_size=block_size))
+            assert [json.loads(line)["id"] for line in lines] == ["m2", "m1"]
+        assert [json.loads(line)["id"] for line in await storage.read_lines(KEY)] == ["m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_append_after_partial_last_line(self, temp_dir):
+        """Test that a new append isn't glued onto an interrupted line"""
+        storage = Storage(temp_dir)
+        await storage.append(KEY, {"id": "m1"})
+        with open(log_path(storage), "ab") as f:
+            f.write(b'{"id":"m2","te')
+
+        # A new process appending to the same log
+        storage = Storage(temp_dir)
+        await storage.append(KEY, {"id": "m3"})
+
+        lines = await storage.read_lines(KEY)
+        assert lines[0] == b'{"id":"m1"}'
+        assert lines[1] == b'{"id":"m2","te'
+        assert lines[2] == b'{"id":"m3"}'
+
+
+class TestLogSealing:
+    """Test compressing the active log into sealed segments"""
+
+    @pytest.mark.asyncio
+    async def test_seal_at_threshold(self, storage):
+        """Test that the active log is sealed once it passes LOG_SEAL_BYTES"""
+        storage.LOG_SEAL_BYTES = 100
+        for i in range(20):
+            await storage.append(KEY, {"id": f"m{i}", "text": "x" * 20})
+
+        log_dir = log_path(storage).parent
+        segments = sorted(p.name for p in log_dir.glob("messages.*.jsonl.gz"))
+
+        assert segments
+        assert segments[0] == "messages.000001.jsonl.gz"
+        assert log_path(storage).stat().st_size <= 100
+        # Each segment holds whole lines
+        for name in segments:
+            for line in gzip.decompress((log_dir / name).read_bytes()).splitlines():
+                json.loads(line)
+
+    @pytest.mark.asyncio
+    async def test_read_across_segments(self, storage):
+        """Test that sealed and active lines read as one log, in order"""
+        storage.LOG_SEAL_BYTES = 100
+        ids = [f"m{i}" for i in range(20)]
+        for message_id in ids:
+            await storage.append(KEY, {"id": message_id, "text": "x" * 20})
+
+        forward = [json.loads(line)["id"] for line in await storage.read_lines(KEY)]
+        backward = [json.loads(line)["id"] for line in storage.iter_lines_reversed(KEY)]
+
+        assert forward == ids
+        assert backward == ids[::-1]
+
+    @pytest.mark.asyncio
+    async def test_delete_log_removes_segments(self, storage):
+        """Test that deleting a log removes its sealed segments too"""
+        storage.LOG_SEAL_BYTES = 100
+        for i in range(20):
+            await storage.append(KEY, {"id": f"m{i}", "text": "x" * 20})
+
+        await storage.delete_log(KEY)
+
+        assert list(log_path(storage).parent.iterdir()) == []
+        assert await storage.read_lines(KEY) == []
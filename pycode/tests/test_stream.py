@@ -0,0 +1,92 @@
+"""Tests for buffered provider streams"""
+
+import asyncio
+
+import pytest
+
+import sys
+sys.path.insert(0, 'src')
+
+from pycode.providers.base import StreamEvent, buffered_stream
+
+
+def text(value: str) -> StreamEvent:
+    return StreamEvent(type="text_delta", data={"text": value})
+
+
+def tool(call_id: str) -> StreamEvent:
+    return StreamEvent(type="tool_use", data={"id": call_id})
+
+
+async def from_list(events, closed=None):
+    """Provider-like stream over events, recording when it is closed"""
+    try:
+        for event in events:
+            yield event
+            await asyncio.sleep(0)
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+class TestBufferedStream:
+    """Test buffered_stream"""
+
+    @pytest.mark.asyncio
+    async def test_passes_events_through(self):
+        """Test that every event arrives in order without coalescing"""
+        events = [StreamEvent(type="start", data={}), text("a"), tool("1"), text("b")]
+
+        received = [e async for e in buffered_stream(from_list(events), coalesce_text=False)]
+
+        assert received == events
+
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_stream(self):
+        """Test that leaving early cancels the reader and closes the provider stream"""
+        closed = []
+        events = [text(str(i)) for i in range(1000)]
+
+        stream = buffered_stream(from_list(events, closed), maxsize=2)
+        async for _ in stream:
+            # Let the reader fill the queue and block on put()
+            await asyncio.sleep(0.01)
+            break
+        await stream.aclose()
+
+        assert closed == [True]
+        pending = [
+            task for task in asyncio.all_tasks()
+            if task is not asyncio.current_task() and not task.done()
+        ]
+        assert pending == []
+
+    @pytest.mark.asyncio
+    async def test_provider_error_reaches_consumer(self):
+        """Test that an error from the provider is raised after the events before it"""
+
+        async def failing():
+            yield text("a")
+            yield tool("1")
+            raise ValueError("stream broke")
+
+        received = []
+        with pytest.raises(ValueError, match="stream broke"):
+            async for event in buffered_stream(failing()):
+                received.append(event)
+
+        assert received == [text("a"), tool("1")]
+
+    @pytest.mark.asyncio
+    async def test_coalesces_queued_text(self):
+        """Test that queued text deltas merge in order, never across other events"""
+        events = [text("a"), text("b"), tool("1"), text("c"), text("d"), tool("2"), text("e")]
+
+        async def burst():
+            # Everything is queued before the consumer looks
+            for event in events:
+                yield event
+
+        received = [e async for e in buffered_stream(burst())]
+
+        assert received == [text("ab"), tool("1"), text("cd"), tool("2"), text("e")]